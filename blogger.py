@@ -1,14 +1,33 @@
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+import blogger_quota as quota
 
 load_dotenv()
 
 SCOPES = ["https://www.googleapis.com/auth/blogger"]
 
-def blogger_service():
-    creds = Credentials(
+# Inserts sent per batch HTTP request by publish_posts
+BATCH_SIZE = 50
+
+# Optional pinned copy of the Blogger v3 discovery document. Without it
+# the copy bundled with google-api-python-client is used; neither needs
+# a network request.
+DISCOVERY_FILE = os.getenv("BLOGGER_DISCOVERY_FILE", "discovery/blogger_v3.json")
+
+# googleapiclient services are not thread safe, so every thread gets its
+# own service; they all share one set of credentials, which refresh the
+# access token once per process and keep it in memory.
+_local = threading.local()
+_credentials = None
+_service_lock = threading.Lock()
+
+def load_credentials():
+    """Builds OAuth credentials from the refresh token in the environment."""
+    return Credentials(
         token=None,
         refresh_token=os.getenv("BLOGGER_REFRESH_TOKEN"),
         token_uri="https://oauth2.googleapis.com/token",
@@ -16,12 +35,33 @@ def blogger_service():
         client_secret=os.getenv("BLOGGER_CLIENT_SECRET"),
         scopes=SCOPES
     )
-    return build("blogger", "v3", credentials=creds)
 
+def blogger_service():
+    """
+    Returns this thread's Blogger service. It is built once from a local
+    discovery document, and the shared credentials refresh themselves
+    only when their access token has expired.
+    """
+    global _credentials
+    service = getattr(_local, "service", None)
+    if service is not None:
+        return service
 
-def publish_post(blog_id: str, title: str, html: str, labels=None, description=None, slug=None, publish_date=None) -> str:
-    service = blogger_service()
-    
+    with _service_lock:
+        if _credentials is None:
+            _credentials = load_credentials()
+
+    if os.path.exists(DISCOVERY_FILE):
+        with open(DISCOVERY_FILE, encoding="utf-8") as f:
+            service = build_from_document(f.read(), credentials=_credentials)
+    else:
+        service = build("blogger", "v3", credentials=_credentials,
+                        static_discovery=True, cache_discovery=False)
+    _local.service = service
+    return service
+
+
+def build_post_body(title: str, html: str, labels=None, description=None, slug=None, publish_date=None) -> dict:
     # Prepare post body
     post_body = {
         "title": title,
@@ -49,9 +89,99 @@ def publish_post(blog_id: str, title: str, html: str, labels=None, description=N
     if publish_date:
         post_body["published"] = publish_date
 
-    post = service.posts().insert(
+    return post_body
+
+
+def publish_post(blog_id: str, title: str, html: str, labels=None, description=None, slug=None, publish_date=None) -> str:
+    service = blogger_service()
+    post_body = build_post_body(title, html, labels, description, slug, publish_date)
+
+    # Only rate limits are retried: after a timeout or 5xx the post may
+    # already exist, and inserting it again would publish it twice
+    post = quota.execute(service.posts().insert(
         blogId=blog_id,
         body=post_body
-    ).execute()
+    ), kind="insert", retry_on=quota.is_rejected)
+
+    return post["url"]
+
+
+def publish_posts(blog_id: str, posts: list, max_attempts: int = 3) -> list:
+    """
+    Inserts (schedules) several posts through batched API requests.
+
+    `posts` is a list of dicts with the keyword arguments of publish_post
+    (title, html, labels, description, slug, publish_date). Up to
+    BATCH_SIZE inserts go out in a single HTTP request; items that were
+    rate limited are resent in a new batch after a jittered backoff. Only
+    as many posts as today's insert budget allows are sent.
+
+    Returns one {"url": ..., "error": ..., "deferred": ...} dict per post,
+    in input order. Deferred posts were not published (no quota left, or
+    still rate limited after all attempts) and should be retried later.
+    Posts that failed with a server or network error carry the error and
+    are never resent: the insert may have gone through.
+
+    If sending a batch fails, the exception is re-raised with the per-post
+    results as its `results`: posts of later batches are deferred, while
+    posts of the failed batch that got no answer carry the error, as they
+    may have been inserted and must not be sent again.
+    """
+    service = blogger_service()
+    results = [{"url": None, "error": None, "deferred": False} for _ in posts]
+
+    affordable = quota.ledger.remaining("insert")
+    pending = list(range(min(len(posts), affordable)))
+    for index in range(len(pending), len(posts)):
+        results[index]["deferred"] = True
+    if len(pending) < len(posts):
+        print(f"Daily insert budget allows {len(pending)} of {len(posts)} posts, deferring the rest.")
+
+    for attempt in range(max_attempts):
+        retry = []
+
+        answered = set()
+
+        def on_response(request_id, response, exception):
+            index = int(request_id)
+            answered.add(index)
+            if exception is None:
+                results[index] = {"url": response["url"], "error": None, "deferred": False}
+            else:
+                results[index] = {"url": None, "error": exception, "deferred": False}
+                if quota.is_rejected(exception):
+                    retry.append(index)
+
+        for start in range(0, len(pending), BATCH_SIZE):
+            in_flight = pending[start:start + BATCH_SIZE]
+            try:
+                batch = service.new_batch_http_request(callback=on_response)
+                for index in in_flight:
+                    quota.bucket.acquire()
+                    body = build_post_body(**posts[index])
+                    batch.add(service.posts().insert(blogId=blog_id, body=body), request_id=str(index))
+                quota.ledger.record("insert", len(in_flight))
+                batch.execute()
+            except Exception as e:
+                for index in in_flight:
+                    if index not in answered:
+                        results[index] = {"url": None, "error": e, "deferred": False}
+                for index in pending[start + BATCH_SIZE:]:
+                    results[index] = {"url": None, "error": None, "deferred": True}
+                quota.ledger.save()
+                e.results = results
+                raise
+
+        if not retry:
+            break
+        if attempt == max_attempts - 1:
+            for index in retry:
+                results[index]["deferred"] = True
+            break
+        delay = quota.backoff_delay(attempt + 1)
+        print(f"Retrying {len(retry)} failed posts in {delay:.1f}s...")
+        time.sleep(delay)
+        pending = sorted(retry)
 
-    return post["url"]
\ No newline at end of file
+    quota.ledger.save()
+    return results
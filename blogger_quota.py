@@ -0,0 +1,164 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import httplib2
+from google.auth.exceptions import TransportError
+from googleapiclient.errors import HttpError
+from disk_cache import load_state, save_state
+
+LEDGER_FILE = "blogger_quota.json"
+QUEUE_FILE = "publish_queue.json"
+
+# Calls we allow ourselves per day, by kind. Blogger's quotas reset at
+# midnight Pacific time, which is what the ledger keys its days on.
+DAILY_BUDGET = {
+    "insert": int(os.getenv("BLOGGER_DAILY_INSERTS", "50")),
+    "list": int(os.getenv("BLOGGER_DAILY_LISTS", "1000"))
+}
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# Sustained request rate and burst size of the token bucket
+REQUESTS_PER_SECOND = 1.0
+BURST = 5
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+RATE_LIMIT_REASONS = (b"rateLimitExceeded", b"userRateLimitExceeded", b"RateLimitExceeded")
+# Network failures below the HTTP layer (timeouts, resets, token refresh)
+TRANSPORT_ERRORS = (OSError, httplib2.HttpLib2Error, TransportError)
+
+def is_rejected(error) -> bool:
+    """
+    Whether Blogger turned the request away (rate limited), so it certainly
+    had no effect. Calls that are not idempotent, like posts.insert, are only
+    retried on these: after a server or network error the post may exist.
+    """
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 403:
+        # 403 is also used for permission problems, which never go away
+        return any(reason in error.content for reason in RATE_LIMIT_REASONS)
+    return error.resp.status == 429
+
+def is_retryable(error) -> bool:
+    """
+    Rate limits, server errors and network failures are worth retrying
+    for idempotent calls; everything else (other HTTP errors, bugs) is not.
+    """
+    if is_rejected(error):
+        return True
+    if isinstance(error, HttpError):
+        return error.resp.status in SERVER_ERROR_STATUSES
+    return isinstance(error, TRANSPORT_ERRORS)
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: random wait in [0, base * 2^attempt]."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+class TokenBucket:
+    """Blocks callers so requests go out at no more than `rate` per second."""
+    def __init__(self, rate=REQUESTS_PER_SECOND, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class QuotaLedger:
+    """
+    Persisted count of Blogger calls made today, by kind ("insert",
+    "list"), so a run knows how much of the daily budget is left.
+    """
+    def __init__(self, filename=LEDGER_FILE, budget=None):
+        self.filename = filename
+        self.budget = budget or DAILY_BUDGET
+        self._lock = threading.Lock()
+        self._state = load_state(filename, {})
+        self._roll_over()
+
+    def _today(self):
+        return datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+    def _roll_over(self):
+        if self._state.get("date") != self._today():
+            self._state = {"date": self._today(), "used": {}}
+
+    def used(self, kind):
+        with self._lock:
+            self._roll_over()
+            return self._state["used"].get(kind, 0)
+
+    def remaining(self, kind):
+        return max(0, self.budget.get(kind, 0) - self.used(kind))
+
+    def record(self, kind, count=1):
+        with self._lock:
+            self._roll_over()
+            self._state["used"][kind] = self._state["used"].get(kind, 0) + count
+
+    def save(self):
+        with self._lock:
+            save_state(self.filename, self._state)
+
+class RetryQueue:
+    """
+    Posts that could not be published (out of quota, or still rate
+    limited after all retries) wait here for the next run.
+    """
+    def __init__(self, filename=QUEUE_FILE):
+        self.filename = filename
+        self.entries = load_state(filename, [])
+
+    def push(self, blog_id, post, item=None):
+        self.entries.append({"blog_id": blog_id, "post": post, "item": item})
+
+    def pop_all(self, blog_id):
+        """Removes and returns every queued entry for a blog."""
+        taken = [e for e in self.entries if e["blog_id"] == blog_id]
+        self.entries = [e for e in self.entries if e["blog_id"] != blog_id]
+        return taken
+
+    def __len__(self):
+        return len(self.entries)
+
+    def save(self):
+        save_state(self.filename, self.entries)
+
+bucket = TokenBucket()
+ledger = QuotaLedger()
+
+def execute(request, kind, retry_on=is_retryable):
+    """
+    Executes a googleapiclient request under the rate limiter, counting it
+    in the ledger and retrying the errors `retry_on` accepts (by default
+    rate limits, 5xx and network errors) with jittered backoff.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        bucket.acquire()
+        ledger.record(kind)
+        try:
+            return request.execute()
+        except Exception as e:
+            if not retry_on(e) or attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = backoff_delay(attempt)
+            print(f"Blogger API error ({e}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
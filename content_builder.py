@@ -1,75 +1,162 @@
-def build_html_content(job_data):
-    """
-    Generates HTML content for a job post matching the specific user-requested headers.
-    """
-    
-    # Clean description (optional: remove inline styles if needed, but usually redundant)
-    description_html = job_data['description']
-    
-    # Format date
-    try:
-        if "Today" in job_data['posted_on']:
-             posted_date = datetime.now().strftime('%d %B %Y')
-        else:
-             posted_date = job_data['posted_on']
-    except:
-        posted_date = datetime.now().strftime('%d %B %Y')
-
-    # Try to clean up company name for logo/display
-    company_name = job_data['company']
-    
-    # Generate SEO content
-    from seo_utils import (
-        generate_summary, generate_related_block, generate_faq_schema, 
-        get_current_year, generate_role_based_prep_guide, 
-        generate_career_growth_section, generate_author_bio, generate_breadcrumb
-    )
-    
-    seo_summary = generate_summary(job_data)
-    related_block = generate_related_block(job_data)
-    faq_schema = generate_faq_schema(job_data)
-    prep_guide = generate_role_based_prep_guide(job_data)
-    career_growth = generate_career_growth_section(job_data)
-    author_bio = generate_author_bio()
-    breadcrumbs = generate_breadcrumb(job_data)
-    current_year = get_current_year()
-
-    html = f"""
-    <div class="job-post-container" style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto;">
+import os
+import random
+import re
+import string
+from datetime import datetime
+from description_processor import process_description
+from seo_utils import (
+    generate_summary, generate_related_block, generate_faq_schema,
+    generate_role_based_prep_guide, generate_career_growth_section,
+    generate_author_bio, generate_breadcrumb, get_role_category, ROLE_TEMPLATES
+)
+
+# Boilerplate list items shared by every post (and by the AI articles
+# in rewriter.py); items may contain inline HTML.
+SELECTION_STEPS = [
+    "Resume Shortlisting",
+    "Online Assessment / Technical Round",
+    "HR Interview",
+    "<em>(Process may vary by company)</em>"
+]
+IMPORTANT_INSTRUCTIONS = [
+    "Read the full job description on the official site before applying.",
+    "Ensure your resume is updated and matches the job requirements.",
+    "Check your email regularly for updates after applying."
+]
+
+def list_items(items, indent="            "):
+    return f"\n{indent}".join(f"<li>{item}</li>" for item in items)
+
+# Fragments that are the same in every post, rendered once at import
+STATIC_FRAGMENTS = {
+    "AUTHOR_BIO": generate_author_bio(),
+    "SELECTION_STEPS": list_items(SELECTION_STEPS),
+    "IMPORTANT_INSTRUCTIONS": list_items(IMPORTANT_INSTRUCTIONS)
+}
+
+# --- Post styles ---
+# Each element of the post is styled by one or more of these classes. In
+# "inline" mode (what every post used so far) the declarations are written
+# into a style attribute; in "class" mode only the class names are, and the
+# rules ship once in STYLESHEET_FILE, which goes into the blog theme.
+
+POST_CLASSES = {
+    "job-post-container": "font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto;",
+    "jp-breadcrumbs": "font-size: 14px; margin-bottom: 15px; color: #666;",
+    "jp-header": "text-align: center; margin-bottom: 20px;",
+    "jp-logo": "max-width: 150px; height: auto; margin-bottom: 10px; border-radius: 8px; border: 1px solid #eee; padding: 5px;",
+    "jp-title": "color: #2c3e50; margin-bottom: 5px; font-size: 24px;",
+    "jp-company": "color: #7f8c8d; font-size: 16px; margin-top: 0;",
+    "jp-heading": "color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;",
+    "jp-overview": "width: 100%; border-collapse: collapse; margin-bottom: 20px;",
+    "jp-cell": "padding: 8px; border-bottom: 1px solid #ddd;",
+    "jp-label": "font-weight: bold;",
+    "jp-wide": "width: 40%;",
+    "jp-list-square": "list-style-type: square; padding-left: 20px;",
+    "description-content": "background: #f9f9f9; padding: 15px; border-radius: 5px;",
+    "jp-list-disc": "list-style-type: disc; padding-left: 20px;",
+    "jp-apply": "text-align: center; margin: 20px 0;",
+    "jp-apply-button": "background-color: #28a745; color: white; padding: 15px 30px; text-decoration: none; font-size: 18px; border-radius: 5px; font-weight: bold; display: inline-block; box-shadow: 0 4px 6px rgba(0,0,0,0.1);",
+    "jp-list-circle": "list-style-type: circle; padding-left: 20px;",
+    "disclaimer": "font-size: 13px; color: #777; border-top: 1px solid #ddd; padding-top: 20px; margin-top: 40px; background-color: #fff3cd; padding: 10px; border-radius: 4px;"
+}
+# Template placeholder -> classes of the element it sits on
+STYLE_ATTRS = {
+    "STYLE_CONTAINER": "job-post-container",
+    "STYLE_BREADCRUMBS": "jp-breadcrumbs",
+    "STYLE_HEADER": "jp-header",
+    "STYLE_LOGO": "jp-logo",
+    "STYLE_TITLE": "jp-title",
+    "STYLE_COMPANY": "jp-company",
+    "STYLE_HEADING": "jp-heading",
+    "STYLE_OVERVIEW": "jp-overview",
+    "STYLE_CELL": "jp-cell",
+    "STYLE_LABEL": "jp-cell jp-label",
+    "STYLE_LABEL_WIDE": "jp-cell jp-label jp-wide",
+    "STYLE_LIST_SQUARE": "jp-list-square",
+    "STYLE_DESCRIPTION": "description-content",
+    "STYLE_LIST_DISC": "jp-list-disc",
+    "STYLE_APPLY": "jp-apply",
+    "STYLE_APPLY_BUTTON": "jp-apply-button",
+    "STYLE_LIST_CIRCLE": "jp-list-circle",
+    "STYLE_DISCLAIMER": "disclaimer"
+}
+# Classes other code and the theme already key on; they are written in
+# inline mode too.
+SEMANTIC_CLASSES = {"job-post-container", "description-content", "disclaimer"}
+
+STYLE_MODES = ("inline", "class")
+# Blogs whose theme carries the stylesheet set "style_mode": "class" in blogs.json
+DEFAULT_STYLE_MODE = os.getenv("POST_STYLE_MODE", "inline")
+STYLESHEET_FILE = os.path.join("pages", "post_styles.css")
+
+def style_attribute(classes, mode):
+    """The attribute text (with its leading space) an element gets in `mode`."""
+    if mode == "class":
+        return f' class="{classes}"'
+    style = " ".join(POST_CLASSES[name] for name in classes.split())
+    if classes in SEMANTIC_CLASSES:
+        return f' class="{classes}" style="{style}"'
+    return f' style="{style}"'
+
+def style_fragments(mode):
+    """STYLE_* placeholder values for a style mode."""
+    if mode not in STYLE_MODES:
+        raise ValueError(f"Unknown style mode {mode!r}, expected one of {STYLE_MODES}")
+    return {placeholder: style_attribute(classes, mode) for placeholder, classes in STYLE_ATTRS.items()}
+
+def post_stylesheet():
+    """CSS for class mode, scoped to the post container so theme rules do not win."""
+    rules = []
+    for name, declarations in POST_CLASSES.items():
+        selector = f".{name}" if name == "job-post-container" else f".job-post-container .{name}"
+        rules.append(f"{selector} {{ {declarations} }}")
+    return "\n".join(rules) + "\n"
+
+def write_stylesheet(path=STYLESHEET_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(post_stylesheet())
+    print(f"Wrote {path}")
+
+# Layout of a job post. Lower-case fields are filled per job (see
+# job_fields), upper-case ones are STATIC_FRAGMENTS and STYLE_* attributes
+# baked in by compile_template. Literal braces are doubled, as for str.format.
+POST_TEMPLATE = """
+    <div{STYLE_CONTAINER}>
         
         <!-- Breadcrumbs -->
-        <div style="font-size: 14px; margin-bottom: 15px; color: #666;">
+        <div{STYLE_BREADCRUMBS}>
             {breadcrumbs}
         </div>
 
         <!-- Job Overview & Thumbnail -->
-        <div style="text-align: center; margin-bottom: 20px;">
-            <img src="{job_data['logo']}" alt="{company_name} Logo" style="max-width: 150px; height: auto; margin-bottom: 10px; border-radius: 8px; border: 1px solid #eee; padding: 5px;">
-            <h1 style="color: #2c3e50; margin-bottom: 5px; font-size: 24px;">{job_data['title']}</h1>
-            <p style="color: #7f8c8d; font-size: 16px; margin-top: 0;">{company_name}</p>
+        <div{STYLE_HEADER}>
+            <img src="{logo}" alt="{company} Logo"{STYLE_LOGO}>
+            <h1{STYLE_TITLE}>{title}</h1>
+            <p{STYLE_COMPANY}>{company}</p>
         </div>
 
         <!-- SEO Summary -->
         {seo_summary}
 
         <!-- 1. Job Overview -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Job Overview</h2>
-        <table style="width: 100%; border-collapse: collapse; margin-bottom: 20px;">
+        <h2{STYLE_HEADING}>Job Overview</h2>
+        <table{STYLE_OVERVIEW}>
             <tr>
-                <td style="padding: 8px; border-bottom: 1px solid #ddd; font-weight: bold; width: 40%;">Role:</td>
-                <td style="padding: 8px; border-bottom: 1px solid #ddd;">{job_data['title']}</td>
+                <td{STYLE_LABEL_WIDE}>Role:</td>
+                <td{STYLE_CELL}>{title}</td>
             </tr>
             <tr>
-                <td style="padding: 8px; border-bottom: 1px solid #ddd; font-weight: bold;">Location:</td>
-                <td style="padding: 8px; border-bottom: 1px solid #ddd;">{job_data['location']}</td>
+                <td{STYLE_LABEL}>Location:</td>
+                <td{STYLE_CELL}>{location}</td>
             </tr>
             <tr>
-                <td style="padding: 8px; border-bottom: 1px solid #ddd; font-weight: bold;">Employment Type:</td>
-                <td style="padding: 8px; border-bottom: 1px solid #ddd;">Full Time / Permanent</td>
-            </tr>
+                <td{STYLE_LABEL}>Employment Type:</td>
+                <td{STYLE_CELL}>Full Time / Permanent</td>
+            </tr>{experience_row}
              <tr>
-                <td style="padding: 8px; border-bottom: 1px solid #ddd; font-weight: bold;">Industry:</td>
-                <td style="padding: 8px; border-bottom: 1px solid #ddd;">IT / Software / Core</td>
+                <td{STYLE_LABEL}>Industry:</td>
+                <td{STYLE_CELL}>IT / Software / Core</td>
             </tr>
         </table>
 
@@ -77,105 +164,100 @@ def build_html_content(job_data):
         {career_growth}
 
         <!-- 3. Organization / Company Name -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Organization / Company Name</h2>
-        <p><strong>{company_name}</strong></p>
+        <h2{STYLE_HEADING}>Organization / Company Name</h2>
+        <p><strong>{company}</strong></p>
         <p><em>(See full description for company details)</em></p>
 
         <!-- 4. Preparation Guide (New Role-Based Section) -->
         {prep_guide}
 
         <!-- 5. Important Dates -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Important Dates</h2>
-        <ul style="list-style-type: square; padding-left: 20px;">
+        <h2{STYLE_HEADING}>Important Dates</h2>
+        <ul{STYLE_LIST_SQUARE}>
             <li><strong>Posted On:</strong> {posted_date}</li>
             <li><strong>Application Deadline:</strong> ASAP (Apply immediately)</li>
         </ul>
 
         <!-- 6. Job Description -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Job Description</h2>
-        <div class="description-content" style="background: #f9f9f9; padding: 15px; border-radius: 5px;">
+        <h2{STYLE_HEADING}>Job Description</h2>
+        <div{STYLE_DESCRIPTION}>
             {description_html}
         </div>
 
         <!-- 7. Educational Qualification -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Educational Qualification</h2>
-        <p>Candidates should possess a relevant degree (B.E/B.Tech, M.E/M.Tech, MCA, or equivalent) from a recognized university. Please refer to the specific requirements in the Job Description above.</p>
+        <h2{STYLE_HEADING}>Educational Qualification</h2>
+        {education}
 
         <!-- 8. Age Limit -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Age Limit</h2>
+        <h2{STYLE_HEADING}>Age Limit</h2>
         <p>As per company rules. Generally, candidates should be at least 18 years of age.</p>
 
         <!-- 9. Salary / Pay Scale -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Salary / Pay Scale</h2>
+        <h2{STYLE_HEADING}>Salary / Pay Scale</h2>
         <p>Best in Industry / Not Disclosed by Company.</p>
 
         <!-- 10. Application Fee -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Application Fee</h2>
+        <h2{STYLE_HEADING}>Application Fee</h2>
         <p><strong>NIL</strong> (No application fee for private jobs).</p>
 
         <!-- 11. Selection Process -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Selection Process</h2>
-        <ul style="list-style-type: disc; padding-left: 20px;">
-            <li>Resume Shortlisting</li>
-            <li>Online Assessment / Technical Round</li>
-            <li>HR Interview</li>
-            <li><em>(Process may vary by company)</em></li>
+        <h2{STYLE_HEADING}>Selection Process</h2>
+        <ul{STYLE_LIST_DISC}>
+            {SELECTION_STEPS}
         </ul>
 
         <!-- 12. How to Apply -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">How to Apply</h2>
+        <h2{STYLE_HEADING}>How to Apply</h2>
         <p>Interested and eligible candidates can apply online using the link provided below.</p>
         <ol>
             <li>Click on the "Apply Now" link below.</li>
-            <li>You will be redirected to the official career page of {company_name}.</li>
+            <li>You will be redirected to the official career page of {company}.</li>
             <li>Read the job details carefully.</li>
             <li>Click on "Apply" and fill in the required details.</li>
             <li>Submit your application.</li>
         </ol>
 
         <!-- 13. Important Links -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Important Links</h2>
-        <div style="text-align: center; margin: 20px 0;">
-            <a href="{job_data['apply_url']}" target="_blank" rel="nofollow" style="background-color: #28a745; color: white; padding: 15px 30px; text-decoration: none; font-size: 18px; border-radius: 5px; font-weight: bold; display: inline-block; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">Apply Now (Official Link)</a>
+        <h2{STYLE_HEADING}>Important Links</h2>
+        <div{STYLE_APPLY}>
+            <a href="{apply_url}" target="_blank" rel="nofollow"{STYLE_APPLY_BUTTON}>Apply Now (Official Link)</a>
         </div>
         
         <!-- Internal Linking Block -->
         {related_block}
 
         <!-- 14. Important Instructions -->
-        <h2 style="color: #d35400; border-bottom: 2px solid #eee; padding-bottom: 5px;">Important Instructions</h2>
-        <ul style="list-style-type: circle; padding-left: 20px;">
-            <li>Read the full job description on the official site before applying.</li>
-            <li>Ensure your resume is updated and matches the job requirements.</li>
-            <li>Check your email regularly for updates after applying.</li>
+        <h2{STYLE_HEADING}>Important Instructions</h2>
+        <ul{STYLE_LIST_CIRCLE}>
+            {IMPORTANT_INSTRUCTIONS}
         </ul>
 
         <!-- 15. Author Bio (New Trust Signal) -->
-        {author_bio}
+        {AUTHOR_BIO}
 
         <!-- 16. Disclaimer -->
-        <div class="disclaimer" style="font-size: 13px; color: #777; border-top: 1px solid #ddd; padding-top: 20px; margin-top: 40px; background-color: #fff3cd; padding: 10px; border-radius: 4px;">
-            <p><strong>Disclaimer:</strong> This job posting is for information purposes only. We are not associated with {company_name} directly. All applications are processed through the official company website. Do not pay any money to anyone for this job.</p>
+        <div{STYLE_DISCLAIMER}>
+            <p><strong>Disclaimer:</strong> This job posting is for information purposes only. We are not associated with {company} directly. All applications are processed through the official company website. Do not pay any money to anyone for this job.</p>
         </div>
         
         <script type="application/ld+json">
         {{
           "@context": "https://schema.org/",
           "@type": "JobPosting",
-          "title": "{job_data['title']}",
-          "description": "{job_data['title']} at {job_data['company']}",
+          "title": "{title}",
+          "description": "{title} at {company}",
           "hiringOrganization": {{
             "@type": "Organization",
-            "name": "{company_name}",
-            "sameAs": "{job_data['company_url']}",
-            "logo": "{job_data['logo']}"
+            "name": "{company}",
+            "sameAs": "{company_url}",
+            "logo": "{logo}"
           }},
-          "datePosted": "{datetime.now().strftime('%Y-%m-%d')}",
+          "datePosted": "{date_posted}",
           "jobLocation": {{
             "@type": "Place",
             "address": {{
               "@type": "PostalAddress",
-              "addressLocality": "{job_data['location']}",
+              "addressLocality": "{location}",
               "addressCountry": "IN"
             }}
           }},
@@ -186,6 +268,294 @@ def build_html_content(job_data):
         {faq_schema}
     </div>
     """
+
+def compile_template(template, static_fragments):
+    """
+    Pre-parses a str.format style template into a flat tuple of literal
+    strings and field names. Static fragments are substituted here, once,
+    and adjacent literals merged, so rendering is a single join.
+    """
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if field in static_fragments:
+            parts.append(static_fragments[field])
+        else:
+            parts.append((field,))
+    compiled = []
+    for part in parts:
+        if isinstance(part, str) and compiled and isinstance(compiled[-1], str):
+            compiled[-1] += part
+        else:
+            compiled.append(part)
+    return tuple(compiled)
+
+# --- Word counting ---
+# Words are counted as the AdSense gate always did (tags stripped, text
+# split on whitespace), except that <script> contents such as the JSON-LD
+# blocks are not words. Counts are tracked per fragment while rendering,
+# so no pass over the finished HTML is needed.
+
+MIN_WORD_COUNT = 900
+
+SCRIPT_RE = re.compile(r'<script\b.*?</script>', re.DOTALL | re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+FIELD_MARK_RE = re.compile(r'\x00(\d+)\x00')
+
+def _stats_of_text(text):
+    """
+    Returns (words, first, last) for a piece of visible text, where first
+    and last tell whether it starts/ends with a word character ("w"),
+    with whitespace ("s"), or is empty (None).
+    """
+    if not text:
+        return (0, None, None)
+    return (len(text.split()),
+            "s" if text[0].isspace() else "w",
+            "s" if text[-1].isspace() else "w")
+
+def text_stats(html):
+    """Word statistics of the visible text of an HTML fragment."""
+    return _stats_of_text(TAG_RE.sub('', SCRIPT_RE.sub('', html)))
+
+def combine_stats(stats):
+    """
+    Adds up the word counts of consecutive fragments. A word split across
+    a fragment boundary (e.g. "Corp" + "." or text around a stripped tag)
+    counts once, exactly as it would in the joined document.
+    """
+    total = 0
+    previous = None
+    for words, first, last in stats:
+        if first is None:
+            continue
+        total += words
+        if previous == "w" and first == "w":
+            total -= 1
+        previous = last
+    return total
+
+def compile_word_counter(compiled):
+    """
+    Finds out which fields of a compiled template land in visible text
+    (not inside a tag attribute or a <script>) and pre-computes the word
+    statistics of the static text around them.
+    Returns a tuple of ("static", stats) and ("field", name) entries.
+    """
+    fields = [part[0] for part in compiled if not isinstance(part, str)]
+    marked = []
+    index = 0
+    for part in compiled:
+        if isinstance(part, str):
+            marked.append(part)
+        else:
+            marked.append(f"\x00{index}\x00")
+            index += 1
+    text = TAG_RE.sub('', SCRIPT_RE.sub('', "".join(marked)))
+
+    counter = []
+    pieces = FIELD_MARK_RE.split(text)
+    for i, piece in enumerate(pieces):
+        if i % 2 == 0:
+            counter.append(("static", _stats_of_text(piece)))
+        else:
+            counter.append(("field", fields[int(piece)]))
+    return tuple(counter)
+
+def count_words(counter, fields, known_stats=None):
+    """
+    Counts the words of a rendered template from its compiled counter and
+    field values. `known_stats` maps fields whose (words, first, last) is
+    already known to those stats, so they are not scanned again.
+    Returns (total, {field: words, "static": words}).
+    """
+    known_stats = known_stats or {}
+    stats = []
+    sections = {"static": 0}
+    for kind, value in counter:
+        if kind == "static":
+            stats.append(value)
+            sections["static"] += value[0]
+        else:
+            field_stats = known_stats.get(value) or text_stats(str(fields[value]))
+            stats.append(field_stats)
+            sections[value] = sections.get(value, 0) + field_stats[0]
+    return combine_stats(stats), sections
+
+# One compiled template per style mode; style attributes sit inside tags,
+# so the word counter is the same for all of them.
+COMPILED_POSTS = {
+    mode: compile_template(POST_TEMPLATE, {**STATIC_FRAGMENTS, **style_fragments(mode)})
+    for mode in STYLE_MODES
+}
+COMPILED_POST = COMPILED_POSTS["inline"]
+POST_WORD_COUNTER = compile_word_counter(COMPILED_POST)
+
+def format_posted_date(posted_on, now):
+    """Turns Workday's postedOn into the date shown in the post."""
+    try:
+        if "Today" in posted_on:
+            return now.strftime('%d %B %Y')
+        return posted_on
+    except:
+        return now.strftime('%d %B %Y')
+
+EXPERIENCE_ROW_TEMPLATE = """
+            <tr>
+                <td{STYLE_LABEL}>Experience:</td>
+                <td{STYLE_CELL}>{experience}</td>
+            </tr>"""
+COMPILED_EXPERIENCE_ROWS = {
+    mode: compile_template(EXPERIENCE_ROW_TEMPLATE, style_fragments(mode))
+    for mode in STYLE_MODES
+}
+
+def experience_row(experience, style_mode):
+    """Overview table row for the required experience, if the description states it."""
+    if not experience:
+        return ""
+    return render(COMPILED_EXPERIENCE_ROWS[style_mode], {"experience": experience})
+
+DEFAULT_EDUCATION = "a relevant degree (B.E/B.Tech, M.E/M.Tech, MCA, or equivalent)"
+
+def education_section(description):
+    """Educational Qualification text, from what the description asks for if anything."""
+    degrees = description["education"]
+    if degrees:
+        degree_text = (degrees[0] if len(degrees) == 1 else ", ".join(degrees[:-1]) + " or " + degrees[-1])
+        degree_text += " or equivalent"
+    else:
+        degree_text = DEFAULT_EDUCATION
+    html = (f"<p>Candidates should possess {degree_text} from a recognized university. "
+            "Please refer to the specific requirements in the Job Description above.</p>")
+    if description["skills"]:
+        html += f"\n        <p><strong>Key Skills:</strong> {', '.join(description['skills'])}</p>"
     return html
-    
-from datetime import datetime
+
+def fixed_fields(job_data, now=None, description=None, style_mode="inline"):
+    """
+    Computes the per-job values of POST_TEMPLATE that involve no random
+    choices, i.e. all but random_sections(). `description` is the
+    process_description() result for the job, computed if not given.
+    """
+    now = now or datetime.now()
+    description = description or process_description(job_data['description'])
+    return {
+        "title": job_data['title'],
+        "company": job_data['company'],
+        "company_url": job_data['company_url'],
+        "location": job_data['location'],
+        "logo": job_data['logo'],
+        "apply_url": job_data['apply_url'],
+        # Sanitized, minified description and the fields extracted from it
+        "description_html": description["html"],
+        "experience_row": experience_row(description["experience"], style_mode),
+        "education": education_section(description),
+        "posted_date": format_posted_date(job_data['posted_on'], now),
+        "date_posted": now.strftime('%Y-%m-%d'),
+        # Generated SEO content
+        "seo_summary": generate_summary(job_data),
+        "related_block": generate_related_block(job_data),
+        "faq_schema": generate_faq_schema(job_data),
+        "breadcrumbs": generate_breadcrumb(job_data)
+    }
+
+def random_sections(job_data, rng=random):
+    """The generated sections that pick random tips with `rng` (in this order)."""
+    return {
+        "prep_guide": generate_role_based_prep_guide(job_data, rng=rng),
+        "career_growth": generate_career_growth_section(job_data, rng=rng)
+    }
+
+def _longest(items, count):
+    return sorted(items, key=lambda item: len(TAG_RE.sub('', item).split()), reverse=True)[:count]
+
+def longest_random_sections(job_data):
+    """random_sections() with the wordiest possible picks, for an upper bound on the post's words."""
+    templates = ROLE_TEMPLATES.get(get_role_category(job_data['title']), ROLE_TEMPLATES["General"])
+    return {
+        "prep_guide": generate_role_based_prep_guide(job_data, _longest(templates["prep_tips"], 3)),
+        "career_growth": generate_career_growth_section(job_data, _longest(templates["career_growth"], 2))
+    }
+
+def job_fields(job_data, now=None, description=None, style_mode="inline", rng=random):
+    """Computes every per-job value used by POST_TEMPLATE."""
+    return {**fixed_fields(job_data, now, description, style_mode), **random_sections(job_data, rng)}
+
+def render(compiled, fields):
+    """Renders a compiled template with the given field values."""
+    return "".join(part if isinstance(part, str) else str(fields[part[0]]) for part in compiled)
+
+def render_post(job_data, now=None, min_words=None, style_mode=None, rng=random):
+    """
+    Renders a job post and counts its words while doing so.
+
+    Returns {"html": ..., "word_count": ..., "sections": {...}, "bytes": ...}
+    where sections holds the words contributed by each template field (and
+    by the static scaffold under "static") and bytes is the UTF-8 size of
+    the HTML. If `min_words` is given and the post would be shorter, the
+    HTML is not assembled and "html" is None.
+    `style_mode` is "inline" or "class" (see POST_CLASSES). The random
+    sections are picked with `rng` (the `random` module by default).
+
+    Thin jobs are rejected before the random sections are generated: if
+    even their wordiest picks cannot reach `min_words`, the result has
+    "html" None and word_count/sections of that upper bound.
+    """
+    style_mode = style_mode or DEFAULT_STYLE_MODE
+    description = process_description(job_data['description'])
+    fields = fixed_fields(job_data, now, description, style_mode)
+    # The description sits in its own block, so its words never join the
+    # surrounding text; the processor already counted them.
+    known = {"description_html": (description["word_count"], "s", "s")}
+    if min_words is not None:
+        most, sections = count_words(POST_WORD_COUNTER, {**fields, **longest_random_sections(job_data)}, known)
+        if most < min_words:
+            return {"html": None, "word_count": most, "sections": sections, "bytes": 0}
+    fields.update(random_sections(job_data, rng))
+    word_count, sections = count_words(POST_WORD_COUNTER, fields, known)
+    html = None
+    size = 0
+    if min_words is None or word_count >= min_words:
+        html = render(COMPILED_POSTS[style_mode], fields)
+        size = len(html.encode("utf-8"))
+    return {"html": html, "word_count": word_count, "sections": sections, "bytes": size}
+
+def style_size_report(job_data, now=None):
+    """
+    Renders a post in every style mode and returns their sizes in bytes,
+    e.g. {"inline": 14210, "class": 9876, "saved_percent": 30.5}.
+    """
+    description = process_description(job_data['description'])
+    # The generated sections are random, so they are rendered once and
+    # only the style dependent parts differ between modes.
+    fields = job_fields(job_data, now, description)
+    report = {}
+    for mode in STYLE_MODES:
+        mode_fields = {**fields, "experience_row": experience_row(description["experience"], mode)}
+        html = render(COMPILED_POSTS[mode], mode_fields)
+        report[mode] = len(html.encode("utf-8"))
+    report["saved_percent"] = round(100 * (report["inline"] - report["class"]) / report["inline"], 1)
+    return report
+
+def build_html_content(job_data, now=None, style_mode=None):
+    """
+    Generates HTML content for a job post matching the specific user-requested headers.
+    """
+    style_mode = style_mode or DEFAULT_STYLE_MODE
+    return render(COMPILED_POSTS[style_mode], job_fields(job_data, now, style_mode=style_mode))
+
+def build_html_content_many(jobs, style_mode=None):
+    """
+    Renders a batch of job posts (e.g. for backfills and exports).
+    Returns the HTML strings in the same order as `jobs`.
+    """
+    now = datetime.now()
+    return [build_html_content(job_data, now, style_mode) for job_data in jobs]
+
+if __name__ == "__main__":
+    # Regenerates the class mode stylesheet after POST_CLASSES changes
+    write_stylesheet()
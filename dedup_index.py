@@ -0,0 +1,148 @@
+import json
+import os
+import re
+import shutil
+from datetime import datetime, timedelta, timezone
+from disk_cache import cache_path, load_state, update_state_entry
+import blogger_quota as quota
+
+INDEX_FILE = "dedup_index.json"
+# Local log of everything this pipeline has published, kept in CACHE_DIR
+# so it persists between runs like the rest of the run state
+PUBLISH_LOG = "published_posts.json"
+# Where the log lived before; copied into CACHE_DIR the first time
+LEGACY_PUBLISH_LOG = "published_posts.json"
+
+# Re-read a little before the last sync so posts created while the
+# previous sync was running are not missed.
+SYNC_OVERLAP = timedelta(hours=1)
+PAGE_SIZE = 500
+
+def normalize_title(title: str) -> str:
+    """
+    Creates a normalized, lowercase hash of a title for comparison.
+    Removes special characters and extra spaces.
+    """
+    # Remove common job post suffixes/prefixes that might vary
+    title = re.sub(r'\b(hiring|walkin|walk-in|drive|notification|vacancy|job|opening)\b', '', title, flags=re.IGNORECASE)
+    # Remove special characters and numbers, keep only letters and spaces
+    title = re.sub(r'[^a-zA-Z\s]', '', title)
+    # Convert to lowercase and remove extra whitespace
+    return " ".join(title.lower().split())
+
+def publish_log_path():
+    """Path of the publish log, seeded from the old repo-root log on first use."""
+    path = cache_path(PUBLISH_LOG)
+    if not os.path.exists(path) and os.path.exists(LEGACY_PUBLISH_LOG):
+        shutil.copyfile(LEGACY_PUBLISH_LOG, path)
+    return path
+
+def load_publish_log(path=None):
+    """Returns the list of entries in the local publish log."""
+    path = path or publish_log_path()
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def append_publish_log(entry, path=None):
+    """
+    Appends one {"title", "url", "date", ...} entry to the publish log.
+
+    The entry is written over the closing bracket instead of rewriting the
+    whole array, so everything before it keeps its byte offset (the
+    sitemap writer resumes reading from the last offset it consumed).
+    """
+    path = path or publish_log_path()
+    data = json.dumps(entry)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"[{data}]")
+        return
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        start = max(0, size - 64)
+        f.seek(start)
+        tail = f.read()
+        end = tail.rindex(b"]")
+        # Entries are objects, so only an empty array has "[" before the "]"
+        empty = tail[:end].rstrip().endswith(b"[")
+        f.seek(start + end)
+        f.truncate()
+        f.write((data if empty else ", " + data).encode("utf-8") + b"]")
+
+class DedupIndex:
+    """
+    Normalized titles of every post on a blog, kept on disk and synced
+    incrementally from the Blogger API.
+
+    The first sync pages through the blog's full history; later syncs
+    only ask for posts published since the previous one. Titles from the
+    local publish log are folded in as well, so lookups are a set
+    membership test against the complete history.
+    """
+    def __init__(self, blog_id, filename=INDEX_FILE):
+        self.blog_id = blog_id
+        self.filename = filename
+        entry = load_state(filename, {}).get(blog_id, {})
+        self.last_sync = entry.get("last_sync")
+        self.titles = set(entry.get("titles", []))
+        for item in load_publish_log():
+            # Entries written before multi-blog publishing have no blog_id
+            if item.get("blog_id", blog_id) == blog_id:
+                self.titles.add(normalize_title(item["title"]))
+
+    def sync(self, service):
+        """
+        Fetches the posts published since the last sync (or all posts on
+        the first run), following nextPageToken. Returns the number of
+        posts fetched.
+        """
+        sync_started = datetime.now(timezone.utc)
+        params = {
+            "blogId": self.blog_id,
+            "maxResults": PAGE_SIZE,
+            "fetchBodies": False,
+            # Scheduled posts count as duplicates too
+            "status": ["live", "scheduled"],
+            "view": "ADMIN",
+            "fields": "nextPageToken,items(title)"
+        }
+        if self.last_sync:
+            since = datetime.fromisoformat(self.last_sync) - SYNC_OVERLAP
+            params["startDate"] = since.isoformat()
+            print(f"Syncing posts published since {since.strftime('%Y-%m-%d %H:%M')} UTC...")
+        else:
+            print("No previous sync found, fetching the full post history...")
+
+        fetched = 0
+        page_token = None
+        while True:
+            if page_token:
+                params["pageToken"] = page_token
+            response = quota.execute(service.posts().list(**params), kind="list")
+            items = response.get("items", [])
+            fetched += len(items)
+            self.titles.update(normalize_title(p["title"]) for p in items)
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        self.last_sync = sync_started.isoformat()
+        self.save()
+        quota.ledger.save()
+        print(f"Fetched {fetched} posts, index holds {len(self.titles)} unique titles.")
+        return fetched
+
+    def contains(self, title):
+        return normalize_title(title) in self.titles
+
+    def add(self, title):
+        self.titles.add(normalize_title(title))
+
+    def save(self):
+        """Writes this blog's entry; other blogs' entries in the file are kept."""
+        update_state_entry(self.filename, self.blog_id, {
+            "last_sync": self.last_sync,
+            "titles": sorted(self.titles)
+        })
@@ -0,0 +1,312 @@
+import re
+from html import escape
+from html.parser import HTMLParser
+
+# Tags kept in the published description; everything else is unwrapped
+# (its text is kept) except DROP_CONTENT_TAGS, which vanish entirely.
+ALLOWED_TAGS = {"p", "br", "ul", "ol", "li", "strong", "b", "em", "i", "u", "a", "h3", "h4"}
+DROP_CONTENT_TAGS = {"script", "style", "noscript", "iframe", "object", "svg", "head", "title"}
+# The post already uses h1/h2, so description headings are demoted
+RENAMED_TAGS = {"h1": "h3", "h2": "h3", "h5": "h4", "h6": "h4"}
+VOID_TAGS = {"br"}
+# Elements whose text is analysed as one unit by the field extractor
+BLOCK_TAGS = {"p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "div", "td", "tr"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+BOLD_TAGS = {"strong", "b"}
+# Longest block (in words) still taken for a bold or "Label:" heading
+MAX_HEADING_WORDS = 8
+# Written where an unwrapped block element (div, td, tr) meets other
+# content, so the text on either side does not run together
+UNWRAPPED_SEPARATORS = {"td": " "}
+DEFAULT_SEPARATOR = "<br>"
+# Output that already ends a line, so no separator is needed after it
+LINE_EDGES = ("<br>",) + tuple(
+    f"<{slash}{tag}>" for tag in ("p", "ul", "ol", "li", "h3", "h4") for slash in ("", "/")
+)
+
+WHITESPACE_RE = re.compile(r'\s+')
+EXPERIENCE_RE = re.compile(
+    r'\b(\d{1,2})\s*(?:\+|plus)?\s*(?:(?:-|–|to)\s*(\d{1,2})\s*\+?\s*)?(?:years|yrs)\b',
+    re.IGNORECASE
+)
+# A number of years only counts as required experience with one of these
+# words close by in the same sentence ("For over 125 years, ..." does not)
+EXPERIENCE_CONTEXT_RE = re.compile(r'\b(?:experience|experienced|exp)\b', re.IGNORECASE)
+EXPERIENCE_CONTEXT_CHARS = 40
+SENTENCE_END_RE = re.compile(r'[.;!?](?:\s|$)')
+EDUCATION_PATTERNS = [
+    ("B.E/B.Tech", r'\bB\.?\s?E\b\.?|\bB\.?\s?Tech\b'),
+    ("M.E/M.Tech", r'\bM\.?\s?E\b\.?|\bM\.?\s?Tech\b'),
+    ("MCA", r'\bMCA\b'),
+    ("BCA", r'\bBCA\b'),
+    ("B.Sc", r'\bB\.?\s?Sc\b'),
+    ("M.Sc", r'\bM\.?\s?Sc\b'),
+    ("MBA", r'\bMBA\b'),
+    ("Bachelor's Degree", r"\bBachelor'?s?\b"),
+    ("Master's Degree", r"\bMaster'?s?\b(?! ?data)"),
+    ("PhD", r'\bPh\.?\s?D\b'),
+    ("Diploma", r'\bDiploma\b'),
+]
+EDUCATION_RES = [(label, re.compile(pattern, re.IGNORECASE)) for label, pattern in EDUCATION_PATTERNS]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Kotlin", "Swift", "Scala",
+    "SQL", "NoSQL", "PostgreSQL", "MySQL", "MongoDB", "Oracle", "Spark", "Hadoop", "Kafka",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Linux", "Git", "Jenkins",
+    "React", "Angular", "Vue", "Node.js", "Django", "Flask", "Spring", ".NET", "REST",
+    "Machine Learning", "Deep Learning", "NLP", "TensorFlow", "PyTorch", "Power BI", "Tableau", "Excel",
+    "Salesforce", "SAP", "Selenium", "Agile", "Scrum", "DevOps", "Microservices",
+]
+SKILLS_RE = re.compile(
+    r'(?<![\w+#.])(' + "|".join(re.escape(skill) for skill in sorted(SKILLS, key=len, reverse=True)) + r')(?![\w+#])'
+)
+SKILL_NAMES = {skill.lower(): skill for skill in SKILLS}
+# Skills that are also everyday English words ("Go beyond", "Excel at");
+# see ambiguous_skill_ok() for when they count
+AMBIGUOUS_SKILLS = {"Go", "Rust", "Swift", "Spring", "Excel", "Spark", "React", "Oracle"}
+SKILLS_SECTION_RE = re.compile(
+    r"\b(?:requirements?|qualifications?|skills?|must[- ]haves?|what you(?:'ll)? (?:bring|need)|"
+    r"you have|experience|tech(?:nical)? stack|technolog(?:y|ies)|tools|preferred)\b",
+    re.IGNORECASE
+)
+SKILL_CONTEXT_RE = re.compile(
+    r'\b(?:experience|proficien\w*|knowledge|familiar\w*|skills?|expertise|programming|languages?|'
+    r'frameworks?|tools|hands-on|stack)\b',
+    re.IGNORECASE
+)
+
+def ambiguous_skill_ok(text, match, block_tag, skills_section):
+    """
+    Whether an AMBIGUOUS_SKILLS match is meant as the skill: next to a
+    skills word, or in a skills section as a list/table item or inside a
+    sentence (a capitalized word opening a sentence is usually just English).
+    """
+    if SKILL_CONTEXT_RE.search(text):
+        return True
+    if not skills_section:
+        return False
+    before = text[:match.start()].rstrip()
+    return block_tag in ("li", "td") or not (before == "" or before.endswith((".", "!", "?", ":")))
+
+def experience_context(text, match):
+    """Whether an EXPERIENCE_RE match has an experience word near it in its sentence."""
+    before = text[max(0, match.start() - EXPERIENCE_CONTEXT_CHARS):match.start()]
+    after = text[match.end():match.end() + EXPERIENCE_CONTEXT_CHARS]
+    before = SENTENCE_END_RE.split(before)[-1]
+    after = SENTENCE_END_RE.split(after)[0]
+    return bool(EXPERIENCE_CONTEXT_RE.search(before) or EXPERIENCE_CONTEXT_RE.search(after))
+
+class _DescriptionParser(HTMLParser):
+    """
+    Streams over the raw description once, writing sanitized HTML to
+    `out` and feeding the text of each block element to the extractor.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        # (output tag, index in `out` where the element starts, has content)
+        self.stack = []
+        self.drop_depth = 0
+        self.block_text = []
+        # Tag that opened the current block, and how much of its text is bold
+        self.block_tag = None
+        self.bold_depth = 0
+        self.bold_chars = 0
+        # Whether the blocks since the last heading are a skills/requirements section
+        self.skills_section = False
+        self.words = 0
+        # Whether the last text ended mid-word with no block boundary since,
+        # so text that follows directly continues that word
+        self.joinable = False
+        # Separator owed by an unwrapped block boundary, written only once
+        # more content follows
+        self.separator = None
+        self.experience = None
+        self.education = []
+        self.skills = []
+
+    # --- field extraction ---
+
+    def _flush_block(self, next_tag=None):
+        text = " ".join("".join(self.block_text).split())
+        bold = self.bold_chars >= len(text.replace(" ", ""))
+        tag = self.block_tag
+        self.block_text = []
+        self.block_tag = next_tag
+        self.bold_chars = 0
+        if not text:
+            return
+        if tag in HEADING_TAGS or (len(text.split()) <= MAX_HEADING_WORDS and (bold or text.endswith(":"))):
+            self.skills_section = bool(SKILLS_SECTION_RE.search(text))
+        if self.experience is None:
+            for match in EXPERIENCE_RE.finditer(text):
+                if experience_context(text, match):
+                    low, high = match.group(1), match.group(2)
+                    self.experience = f"{low}-{high} years" if high else f"{low}+ years"
+                    break
+        for label, pattern in EDUCATION_RES:
+            if label not in self.education and pattern.search(text):
+                self.education.append(label)
+        for match in SKILLS_RE.finditer(text):
+            skill = SKILL_NAMES.get(match.group(1).lower(), match.group(1))
+            if skill in AMBIGUOUS_SKILLS and not ambiguous_skill_ok(text, match, tag, self.skills_section):
+                continue
+            if skill not in self.skills:
+                self.skills.append(skill)
+
+    # --- sanitizing ---
+
+    def _owe_separator(self, tag):
+        if self.separator != DEFAULT_SEPARATOR:
+            self.separator = UNWRAPPED_SEPARATORS.get(tag, DEFAULT_SEPARATOR)
+
+    def _separate(self):
+        separator, self.separator = self.separator, None
+        if not separator or not self.out or self.out[-1].endswith(LINE_EDGES):
+            return
+        if self.out[-1].endswith(" "):
+            if separator == " ":
+                return
+            # A line break replaces the space before it
+            self.out[-1] = self.out[-1].rstrip()
+            if not self.out[-1]:
+                self.out.pop()
+        self.out.append(separator)
+
+    def _mark_content(self):
+        if self.stack:
+            self.stack[-1][2] = True
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.drop_depth += 1
+            return
+        if self.drop_depth:
+            return
+        if tag in BLOCK_TAGS or tag in VOID_TAGS:
+            self._flush_block(tag if tag in BLOCK_TAGS else None)
+            self.joinable = False
+        if tag in BOLD_TAGS:
+            self.bold_depth += 1
+        tag = RENAMED_TAGS.get(tag, tag)
+        if tag not in ALLOWED_TAGS:
+            if tag in BLOCK_TAGS:
+                self._owe_separator(tag)
+            return
+        if tag in VOID_TAGS:
+            # A line break only counts as content between other content
+            if self.out and not self.out[-1].endswith(("<br>", ">")):
+                self.out.append("<br>")
+            return
+        if tag == "a":
+            href = dict(attrs).get("href") or ""
+            if not href.startswith(("http://", "https://")):
+                # Unwrap links without a usable target
+                return
+            start = len(self.out)
+            self._separate()
+            self.stack.append(["a", start, False])
+            self.out.append(f'<a href="{escape(href)}" target="_blank" rel="nofollow">')
+            return
+        start = len(self.out)
+        if tag not in BLOCK_TAGS and tag not in ("ul", "ol"):
+            self._separate()
+        self.stack.append([tag, start, False])
+        self.out.append(f"<{tag}>")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.drop_depth = max(0, self.drop_depth - 1)
+            return
+        if self.drop_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self._flush_block()
+            self.joinable = False
+        if tag in BOLD_TAGS:
+            self.bold_depth = max(0, self.bold_depth - 1)
+        tag = RENAMED_TAGS.get(tag, tag)
+        if tag not in ALLOWED_TAGS:
+            if tag in BLOCK_TAGS:
+                self._owe_separator(tag)
+            return
+        if tag in VOID_TAGS:
+            return
+        # Close the innermost matching element (and anything left open in it)
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > depth:
+            open_tag, start, has_content = self.stack.pop()
+            if not has_content:
+                # Empty element: drop it and whatever whitespace it held
+                del self.out[start:]
+            else:
+                # Trailing line breaks inside an element are noise
+                while self.out and self.out[-1] == "<br>":
+                    self.out.pop()
+                self.out.append(f"</{open_tag}>")
+                self._mark_content()
+
+    def handle_data(self, data):
+        if self.drop_depth:
+            return
+        self.block_text.append(data)
+        if self.bold_depth:
+            self.bold_chars += len("".join(data.split()))
+        text = WHITESPACE_RE.sub(" ", data)
+        if not text.strip():
+            # Keep a single separating space between inline content only
+            if self.out and not self.out[-1].endswith((" ", ">")):
+                self.out.append(" ")
+            self.joinable = False
+            return
+        self.words += len(text.split())
+        if self.joinable and not text[0].isspace():
+            self.words -= 1
+        self.joinable = not text[-1].isspace()
+        self._separate()
+        self.out.append(escape(text, quote=False))
+        self._mark_content()
+
+    def close(self):
+        super().close()
+        self._flush_block()
+        while self.stack:
+            self.handle_endtag(self.stack[-1][0])
+
+def process_description(raw_html):
+    """
+    Sanitizes and minifies a Workday jobDescription in a single pass:
+    keeps only ALLOWED_TAGS (without attributes, except link targets),
+    drops scripts/styles, empty elements and redundant whitespace, and
+    extracts the fields used by the post's boilerplate sections.
+
+    Returns {"html", "word_count", "experience", "education", "skills"}
+    where word_count counts the visible words (block elements separate
+    words, inline ones do not; unwrapped div/tr/td boundaries become a
+    <br> or a space in the html), experience is e.g. "2-5 years" or None,
+    and education and skills are lists in order of first appearance.
+
+    Experience is only taken from a number of years with an experience
+    word next to it, and skills that are also common English words
+    (AMBIGUOUS_SKILLS) only inside a requirements/skills section or next
+    to a skills word (see ambiguous_skill_ok).
+    """
+    parser = _DescriptionParser()
+    parser.feed(raw_html or "")
+    parser.close()
+    html = "".join(parser.out).strip()
+    return {
+        "html": html,
+        "word_count": parser.words,
+        "experience": parser.experience,
+        "education": parser.education,
+        "skills": parser.skills
+    }
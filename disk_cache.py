@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# All persistent run state lives here. The GitHub Action restores and
+# saves this directory between runs (see .github/workflows/autoblog.yml).
+CACHE_DIR = os.getenv("AUTOBLOG_CACHE_DIR", "cache")
+
+def cache_path(name):
+    """Returns the path of a file inside CACHE_DIR, creating the directory."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, name)
+
+class DiskCache:
+    """
+    A small SQLite backed key/value cache for JSON values.
+
+    Entries expire `ttl` seconds after they were written and the cache
+    keeps at most `max_entries` rows, evicting the least recently used
+    ones first. Safe to share between threads.
+    """
+    def __init__(self, path, ttl=7 * 24 * 3600, max_entries=5000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self.purge_expired()
+
+    def get(self, key):
+        """Returns the cached value for `key`, or None if missing/expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        """Stores `value` under `key` and evicts the oldest entries if full."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        """Deletes every entry older than the TTL."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE created_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def load_state(name, default):
+    """Loads a JSON state file from CACHE_DIR, or returns `default`."""
+    path = cache_path(name)
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable state file {path}: {e}")
+        return default
+
+_state_lock = threading.Lock()
+
+def update_state_entry(name, key, value):
+    """
+    Sets one top-level key of a JSON state file shared by several owners
+    (e.g. one entry per blog), re-reading the file first so the other
+    owners' entries are kept as they are on disk.
+    """
+    with _state_lock:
+        state = load_state(name, {})
+        state[key] = value
+        save_state(name, state)
+
+def save_state(name, data):
+    """Atomically writes a JSON state file into CACHE_DIR."""
+    path = cache_path(name)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
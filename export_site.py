@@ -0,0 +1,208 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+from datetime import datetime
+from html import escape
+
+OUTPUT_DIR = "site"
+MANIFEST_FILE = ".manifest.json"
+# Related posts of every job from the previous export, see related_posts()
+RELATED_FILE = ".related.json"
+PAGES_DIR = "pages"
+# A change to any of these can change every rendered post
+RENDERER_FILES = ["content_builder.py", "seo_utils.py", "description_processor.py", "export_site.py"]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1" />
+    <title>{title}</title>
+    <meta name="description" content="{description}" />{head}
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+def renderer_version():
+    """Hash of the code that turns a job into a page."""
+    digest = hashlib.sha256()
+    for name in RENDERER_FILES:
+        with open(name, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def content_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def url_suffix(job):
+    """Short, stable hash of a job's apply URL, to tell apart jobs with the same slug."""
+    return hashlib.sha256(job["apply_url"].encode("utf-8")).hexdigest()[:8]
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def related_posts(warehouse, jobs, output_dir=OUTPUT_DIR):
+    """
+    {apply_url: related posts} for every job. Related posts only change
+    when something is published, so while the warehouse's published_state
+    is what the previous export saw, its lists are reused without a query.
+    """
+    path = os.path.join(output_dir, RELATED_FILE)
+    previous = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            previous = json.load(f)
+    state = warehouse.published_state()
+    cached = previous.get("jobs", {}) if previous.get("published_state") == state else {}
+    entries = {}
+    for job in jobs:
+        entry = cached.get(job["apply_url"])
+        if not entry or entry["for"] != [job["title"], job.get("company")]:
+            entry = {"for": [job["title"], job.get("company")], "posts": warehouse.related_posts(job)}
+        entries[job["apply_url"]] = entry
+    if entries != previous.get("jobs") or state != previous.get("published_state"):
+        write_file(path, json.dumps({"published_state": state, "jobs": entries}))
+    return {url: entry["posts"] for url, entry in entries.items()}
+
+class SiteExport:
+    """
+    Renders pages into `output_dir`, skipping any page whose inputs hash to
+    what the manifest recorded last time and whose file still exists.
+    Pages from earlier exports that are not produced again are pruned.
+    """
+    def __init__(self, output_dir=OUTPUT_DIR, force=False):
+        self.output_dir = output_dir
+        self.force = force
+        self.manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+        self.previous = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.previous = json.load(f)
+        self.manifest = {}
+        self.written = 0
+        self.skipped = 0
+
+    def page(self, rel_path, input_hash, render):
+        """Writes rel_path with render() unless its input hash is unchanged."""
+        self.manifest[rel_path] = input_hash
+        path = os.path.join(self.output_dir, rel_path)
+        if not self.force and self.previous.get(rel_path) == input_hash and os.path.exists(path):
+            self.skipped += 1
+            return
+        write_file(path, render())
+        self.written += 1
+
+    def prune(self):
+        """Deletes pages that an earlier export wrote and this one did not."""
+        removed = 0
+        for rel_path in self.previous:
+            if rel_path in self.manifest:
+                continue
+            path = os.path.join(self.output_dir, rel_path)
+            if os.path.exists(path):
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def save(self):
+        write_file(self.manifest_path, json.dumps(self.manifest, indent=2, sort_keys=True))
+
+def export_site(output_dir=OUTPUT_DIR, jobs=None, style_mode="class", force=False):
+    """
+    Renders every job in the warehouse (or `jobs`) and the static
+    pages/*.html into output_dir:
+    jobs/<slug>.html per job, <name>.html per static page, an index.html
+    and the post stylesheet. Returns the SiteExport with its counters.
+
+    When several jobs share a slug, the oldest keeps it and the others get
+    their url_suffix() appended, so no page overwrites another.
+    """
+    from content_builder import render_post, STYLESHEET_FILE
+    from job_warehouse import JobWarehouse
+    from seo_utils import (
+        generate_seo_title, generate_slug, generate_meta_description, generate_meta_tags, get_current_year
+    )
+
+    warehouse = JobWarehouse()
+    try:
+        jobs = list(warehouse.iter_jobs()) if jobs is None else jobs
+        related = related_posts(warehouse, jobs, output_dir)
+    finally:
+        warehouse.close()
+    export = SiteExport(output_dir, force)
+    version = renderer_version()
+    stylesheet_link = '\n    <link rel="stylesheet" href="/post_styles.css" />' if style_mode == "class" else ""
+
+    index_entries = {}
+    for job in jobs:
+        # Related post links are part of the page, so part of its inputs too
+        job = {**job, "related_posts": related.get(job["apply_url"], [])}
+        slug = generate_slug(job)
+        if slug in index_entries:
+            slug = f"{slug}-{url_suffix(job)}"
+        title = generate_seo_title(job)
+        index_entries[slug] = title
+
+        def render_job(job=job, title=title, slug=slug):
+            # Generated sections are random; a generator seeded per page
+            # gives the same page for unchanged inputs, without touching
+            # the global random state.
+            now = datetime.fromisoformat(job["scraped_at"]) if job.get("scraped_at") else datetime.now()
+            rendered = render_post(job, now=now, style_mode=style_mode, rng=random.Random(slug))
+            return PAGE_TEMPLATE.format(
+                title=escape(title),
+                description=escape(generate_meta_description(job)),
+                head=stylesheet_link + generate_meta_tags(job).rstrip(),
+                body=rendered["html"]
+            )
+
+        # The SEO title carries the current year, so it is an input too
+        input_hash = content_hash(version, style_mode, get_current_year(), job)
+        export.page(os.path.join("jobs", f"{slug}.html"), input_hash, render_job)
+
+    for page_path in sorted(glob.glob(os.path.join(PAGES_DIR, "*.html"))):
+        with open(page_path, encoding="utf-8") as f:
+            body = f.read()
+        name = os.path.basename(page_path)
+        title = name[:-len(".html")].replace("_", " ").title()
+        export.page(name, content_hash(version, stylesheet_link, body),
+                    lambda body=body, title=title: PAGE_TEMPLATE.format(
+                        title=title, description=title, head=stylesheet_link, body=body))
+
+    links = "\n".join(f'<li><a href="/jobs/{slug}.html">{escape(title)}</a></li>'
+                      for slug, title in sorted(index_entries.items()))
+    export.page("index.html", content_hash(version, stylesheet_link, index_entries),
+                lambda: PAGE_TEMPLATE.format(title="FirstJobTech", description="Latest IT jobs",
+                                             head=stylesheet_link, body=f"<ul>\n{links}\n</ul>"))
+
+    with open(STYLESHEET_FILE, encoding="utf-8") as f:
+        stylesheet = f.read()
+    export.page("post_styles.css", content_hash(stylesheet), lambda: stylesheet)
+
+    removed = export.prune()
+    export.save()
+    print(f"Exported {len(jobs)} jobs to {output_dir}: {export.written} pages written, "
+          f"{export.skipped} unchanged, {removed} removed.")
+    return export
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render all known jobs and static pages to a local site.")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Output directory (default: %(default)s)")
+    parser.add_argument("--style-mode", default="class", choices=["inline", "class"])
+    parser.add_argument("--force", action="store_true", help="Re-render every page")
+    args = parser.parse_args()
+    export_site(args.output, style_mode=args.style_mode, force=args.force)
@@ -0,0 +1,72 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Brotli is only negotiated when a decoder is installed (urllib3 picks up
+# either package automatically), otherwise we stick to gzip/deflate.
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# (connect, read) timeout applied to every request that does not set one
+DEFAULT_TIMEOUT = (5, 15)
+
+# Number of per-host connection pools kept alive, and the number of
+# keep-alive connections kept in each of them. Hosts shared by several
+# tenants (e.g. wd1.myworkdaysite.com) reuse the same pool.
+POOL_HOSTS = 128
+POOL_PER_HOST = 8
+
+RETRY = Retry(
+    total=3,
+    connect=3,
+    read=2,
+    status=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    # Workday's search endpoint is a read-only POST, so it is safe to retry
+    allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+class PooledSession(requests.Session):
+    """A requests.Session that applies DEFAULT_TIMEOUT unless told otherwise."""
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        return super().request(method, url, **kwargs)
+
+def build_session():
+    """Creates a new pooled session with retries and compression enabled."""
+    session = PooledSession()
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST, max_retries=RETRY)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": ACCEPT_ENCODING
+    })
+    return session
+
+def get_session():
+    """
+    Returns the process-wide session shared by all scrapers, so TCP and
+    TLS connections are reused across requests, tenants and threads.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+        return _session
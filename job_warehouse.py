@@ -0,0 +1,256 @@
+import json
+import re
+import sqlite3
+import sys
+import threading
+import zlib
+from datetime import datetime
+from html import unescape
+from disk_cache import cache_path
+from dedup_index import normalize_title
+from description_processor import process_description
+
+WAREHOUSE_FILE = "jobs.sqlite3"
+# Columns stored as-is; the description is kept zlib-compressed
+JOB_COLUMNS = ("title", "company", "company_url", "location", "posted_on", "posted_age_days", "logo", "source")
+RELATED_POSTS = 4
+# A skill becomes a post label once this many published posts list it
+# (see job_skills), so its label page is never thin
+MIN_LABEL_POSTS = 3
+MAX_SKILL_LABELS = 3
+
+TAG_RE = re.compile(r'<[^>]+>')
+WORD_RE = re.compile(r'\w+')
+
+def plain_text(html):
+    """Visible text of an HTML description, for the full-text index."""
+    return " ".join(unescape(TAG_RE.sub(" ", html or "")).split())
+
+def match_any(text):
+    """An FTS5 query matching any word of `text` (each word quoted, so no operators)."""
+    words = [word for word in WORD_RE.findall(text.lower()) if len(word) > 1]
+    return " OR ".join(f'"{word}"' for word in dict.fromkeys(words))
+
+class JobWarehouse:
+    """
+    Every job the scrapers have produced, in a local SQLite database keyed
+    by apply URL, with compressed descriptions, where and when each job was
+    published, an FTS5 index over title, company, location and
+    description, and the skills process_description() extracted from each
+    job (`job_skills`). Safe to share between threads.
+
+    The index is contentless (the text lives compressed in `jobs`), so
+    replacing a job's row removes its old terms explicitly.
+    """
+    def __init__(self, path=None):
+        self.path = path or cache_path(WAREHOUSE_FILE)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY,"
+            " apply_url TEXT UNIQUE NOT NULL,"
+            " normalized_title TEXT NOT NULL,"
+            + "".join(f" {column}," for column in JOB_COLUMNS) +
+            " description BLOB,"
+            " first_seen TEXT NOT NULL,"
+            " last_seen TEXT NOT NULL,"
+            " blog_id TEXT,"
+            " post_url TEXT,"
+            " canonical_url TEXT,"
+            " published_at TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_normalized_title ON jobs (normalized_title)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_published_at ON jobs (published_at)")
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+            " title, company, location, description, content='')"
+        )
+        has_skills = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_skills'"
+        ).fetchone()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_skills ("
+            " job_id INTEGER NOT NULL REFERENCES jobs (id),"
+            " skill TEXT NOT NULL,"
+            " PRIMARY KEY (job_id, skill))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS job_skills_skill ON job_skills (skill)")
+        if not has_skills:
+            # Databases from before job_skills existed
+            for row in self._conn.execute("SELECT id, description FROM jobs").fetchall():
+                self._set_skills(row["id"], zlib.decompress(row["description"]).decode("utf-8"))
+        self._conn.commit()
+
+    def _index_values(self, title, company, location, description_html):
+        return (title or "", company or "", location or "", plain_text(description_html))
+
+    def _set_skills(self, job_id, description_html):
+        self._conn.execute("DELETE FROM job_skills WHERE job_id = ?", (job_id,))
+        self._conn.executemany(
+            "INSERT INTO job_skills (job_id, skill) VALUES (?, ?)",
+            [(job_id, skill) for skill in process_description(description_html)["skills"]]
+        )
+
+    def upsert_jobs(self, jobs):
+        """Stores scraped jobs, refreshing ones seen before. Returns the number of new jobs."""
+        now = datetime.now().isoformat()
+        added = 0
+        with self._lock:
+            for job in jobs:
+                row = self._conn.execute(
+                    "SELECT id, title, company, location, description FROM jobs WHERE apply_url = ?",
+                    (job["apply_url"],)
+                ).fetchone()
+                values = [job.get(column) for column in JOB_COLUMNS]
+                description = zlib.compress(job.get("description", "").encode("utf-8"))
+                if row is None:
+                    cursor = self._conn.execute(
+                        f"INSERT INTO jobs (apply_url, normalized_title, {', '.join(JOB_COLUMNS)},"
+                        " description, first_seen, last_seen)"
+                        f" VALUES (?, ?, {', '.join('?' for _ in JOB_COLUMNS)}, ?, ?, ?)",
+                        [job["apply_url"], normalize_title(job["title"]), *values, description, now, now]
+                    )
+                    job_id = cursor.lastrowid
+                    added += 1
+                else:
+                    job_id = row["id"]
+                    old_description = zlib.decompress(row["description"]).decode("utf-8")
+                    self._conn.execute(
+                        "INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)"
+                        " VALUES ('delete', ?, ?, ?, ?, ?)",
+                        (job_id, *self._index_values(row["title"], row["company"], row["location"],
+                                                     old_description))
+                    )
+                    self._conn.execute(
+                        f"UPDATE jobs SET normalized_title = ?, {', '.join(f'{c} = ?' for c in JOB_COLUMNS)},"
+                        " description = ?, last_seen = ? WHERE id = ?",
+                        [normalize_title(job["title"]), *values, description, now, job_id]
+                    )
+                self._conn.execute(
+                    "INSERT INTO jobs_fts (rowid, title, company, location, description) VALUES (?, ?, ?, ?, ?)",
+                    (job_id, *self._index_values(job["title"], job.get("company"), job.get("location"),
+                                                 job.get("description")))
+                )
+                self._set_skills(job_id, job.get("description", ""))
+            self._conn.commit()
+        return added
+
+    def mark_published(self, apply_url, blog_id, post_url, canonical_url):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET blog_id = ?, post_url = ?, canonical_url = ?, published_at = ?"
+                " WHERE apply_url = ?",
+                (blog_id, post_url, canonical_url, datetime.now().isoformat(), apply_url)
+            )
+            self._conn.commit()
+
+    def _job(self, row):
+        job = {column: row[column] for column in JOB_COLUMNS}
+        job["apply_url"] = row["apply_url"]
+        job["description"] = zlib.decompress(row["description"]).decode("utf-8")
+        job["scraped_at"] = row["first_seen"]
+        return job
+
+    def iter_jobs(self):
+        """Every stored job, oldest first, as the job dicts the scrapers produce."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        for row in rows:
+            yield self._job(row)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    # --- Query helpers ---
+
+    def published_elsewhere(self, job):
+        """
+        The post URL if this job, or a job with the same normalized title
+        at the same company, was already published on any blog, else None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT post_url FROM jobs WHERE published_at IS NOT NULL"
+                " AND (apply_url = ? OR (normalized_title = ? AND company = ?)) LIMIT 1",
+                (job["apply_url"], normalize_title(job["title"]), job.get("company"))
+            ).fetchone()
+        return row["post_url"] if row else None
+
+    def search(self, query, limit=20, published_only=False):
+        """Jobs matching an FTS5 query, best match first."""
+        sql = ("SELECT jobs.* FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid"
+               " WHERE jobs_fts MATCH ?")
+        if published_only:
+            sql += " AND jobs.published_at IS NOT NULL"
+        sql += " ORDER BY bm25(jobs_fts) LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, (query, limit)).fetchall()
+        return [self._job(row) for row in rows]
+
+    def related_posts(self, job, limit=RELATED_POSTS):
+        """
+        Published posts most similar to `job` by title and company, as
+        {"title", "url"} dicts for internal links.
+        """
+        query = match_any(f"{job['title']} {job.get('company', '')}")
+        if not query:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT jobs.title, jobs.company, jobs.canonical_url FROM jobs_fts"
+                " JOIN jobs ON jobs.id = jobs_fts.rowid"
+                " WHERE jobs_fts MATCH ? AND jobs.published_at IS NOT NULL"
+                " AND jobs.canonical_url IS NOT NULL AND jobs.apply_url != ?"
+                " ORDER BY bm25(jobs_fts, 10.0, 5.0, 1.0, 0.5) LIMIT ?",
+                (f"{{title company}} : ({query})", job["apply_url"], limit)
+            ).fetchall()
+        return [{"title": f"{row['company']} {row['title']}", "url": row["canonical_url"]} for row in rows]
+
+    def count_published_skill(self, skill):
+        """Number of published posts whose job lists `skill` among its extracted skills."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM job_skills JOIN jobs ON jobs.id = job_skills.job_id"
+                " WHERE job_skills.skill = ? AND jobs.published_at IS NOT NULL",
+                (skill,)
+            ).fetchone()[0]
+
+    def skill_labels(self, job, min_posts=MIN_LABEL_POSTS):
+        """'<Skill> Jobs' labels for the job's skills that enough published posts share."""
+        labels = []
+        for skill in process_description(job.get("description", ""))["skills"]:
+            if self.count_published_skill(skill) >= min_posts:
+                labels.append(f"{skill} Jobs")
+            if len(labels) >= MAX_SKILL_LABELS:
+                break
+        return labels
+
+    def published_state(self):
+        """Changes whenever a post is published, so derived data can be reused until then."""
+        with self._lock:
+            count, latest = self._conn.execute(
+                "SELECT COUNT(*), MAX(published_at) FROM jobs WHERE published_at IS NOT NULL"
+            ).fetchone()
+        return f"{count} {latest}"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+if __name__ == "__main__":
+    # python job_warehouse.py search "python bangalore"
+    # python job_warehouse.py import <jobs.jsonl>   (backfill from JSON lines)
+    warehouse = JobWarehouse()
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "search":
+        for job in warehouse.search(match_any(" ".join(sys.argv[2:]))):
+            print(f"{job['company']} - {job['title']} ({job['location']}) {job['apply_url']}")
+    elif command == "import":
+        with open(sys.argv[2], encoding="utf-8") as f:
+            jobs = [json.loads(line) for line in f if line.strip()]
+        print(f"Imported {warehouse.upsert_jobs(jobs)} new jobs from {len(jobs)} records.")
+    else:
+        print(f"{len(warehouse)} jobs in {warehouse.path}")
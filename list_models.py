@@ -1,10 +1,7 @@
 
-import os
-from dotenv import load_dotenv
-from google import genai
+from rewriter import get_client
 
-load_dotenv()
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+client = get_client()
 
 try:
     for model in client.models.list():
@@ -1,13 +1,19 @@
 import json
 import random
 import time
-import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time as dt_time, timedelta
 from dotenv import load_dotenv
-from scraper import scrape_offcampusjobs4u, scrape_job4freshers
 # from rewriter import rewrite_content
 from formatter import markdown_to_html
-from blogger import publish_post, blogger_service
+from blogger import publish_posts, blogger_service
+from dedup_index import append_publish_log
+from seo_utils import generate_canonical_url
+from sitemap import update_sitemaps
+from publishing_planner import BlogPlan, plan_publishing
+from job_warehouse import JobWarehouse
+from watermarks import TenantWatermarks
+import blogger_quota as quota
 
 load_dotenv()
 
@@ -15,45 +21,7 @@ load_dotenv()
 with open("blogs.json") as f:
     blogs = json.load(f)
 
-# ✅ POST ONLY TO TECKFY
-TECKFY = blogs[0]
-
-def normalize_title(title: str) -> str:
-    """
-    Creates a normalized, lowercase hash of a title for comparison.
-    Removes special characters and extra spaces.
-    """
-    # Remove common job post suffixes/prefixes that might vary
-    title = re.sub(r'\b(hiring|walkin|walk-in|drive|notification|vacancy|job|opening)\b', '', title, flags=re.IGNORECASE)
-    # Remove special characters and numbers, keep only letters and spaces
-    title = re.sub(r'[^a-zA-Z\s]', '', title)
-    # Convert to lowercase and remove extra whitespace
-    return " ".join(title.lower().split())
-
-def get_existing_titles(service, blog_id: str) -> set:
-    """
-    Fetches the last 100 posts from the blog and returns a set of
-    normalized titles to check for duplicates.
-    """
-    print("Fetching existing posts from Blogger API to check for duplicates...")
-    try:
-        posts = service.posts().list(
-            blogId=blog_id,
-            maxResults=100, # Fetch the last 100 posts
-            fields="items(title)" # Only fetch the titles to save bandwidth
-        ).execute()
-        
-        normalized_titles = {normalize_title(p['title']) for p in posts.get('items', [])}
-        print(f"Found {len(normalized_titles)} existing unique post titles.")
-        return normalized_titles
-    except Exception as e:
-        print(f"Error fetching existing posts: {e}")
-        # If API fails, return an empty set to proceed with caution
-        return set()
-
-def is_duplicate(title: str, existing_titles: set) -> bool:
-    """Checks if a title's normalized version already exists."""
-    return normalize_title(title) in existing_titles
+# ✅ POST TO EVERY ENABLED BLOG (see publishing_planner.py)
 
 def is_within_posting_hours():
     """Check if current time is within 6AM-6PM window."""
@@ -115,119 +83,190 @@ def generate_labels(title: str) -> list:
         
     return list(set(labels)) # Return unique labels
 
+def prepare_posts(plan, base_time):
+    """
+    Builds the HTML and SEO metadata for every job assigned to a blog.
+    Returns (items, posts) for the jobs that passed the AdSense gate.
+    """
+    from seo_utils import generate_seo_title, generate_slug, generate_meta_description, generate_labels
+
+    scheduled_times = plan.schedule_times(len(plan.items), base_time)
+    scheduled_items = []
+    posts = []
+    for i, item in enumerate(plan.items):
+        
+        publish_at = scheduled_times[i]
+        # Convert to ISO 8601 format required by Blogger API (RFC 3339)
+        # We must ensure it has timezone info. .astimezone() uses system local time.
+        publish_date_iso = publish_at.astimezone().isoformat()
+        
+        print("-" * 50)
+        print(f"[{plan.blog['name']}] Preparing ({i+1}/{len(plan.items)}): {item['title']} - {item['company']}")
+        print(f"   > Scheduled Time: {publish_at.astimezone().strftime('%Y-%m-%d %I:%M %p %Z')}")
+
+        # Internal links to similar posts we published before
+        item["related_posts"] = warehouse.related_posts(item)
+
+        # Build HTML content. 🚨 AdSense Gate: the renderer counts words as it
+        # goes and does not assemble posts below the minimum.
+        try:
+            rendered = render_post(item, min_words=MIN_WORD_COUNT, style_mode=plan.blog.get("style_mode"))
+        except Exception as e:
+            print(f"Error building HTML for {item['title']}: {e}")
+            continue
+        
+        word_count = rendered["word_count"]
+        if rendered["html"] is None:
+            print(f"⚠️ Skipping post due to Low Word Count: at most {word_count} words (Minimum {MIN_WORD_COUNT} required)")
+            continue
+        else:
+            print(f"✅ Word Count Pass: {word_count} words")
+        print(f"   > Size: {rendered['bytes']} bytes ({plan.blog.get('style_mode') or DEFAULT_STYLE_MODE} styles)")
+        html_content = rendered["html"]
+
+        # Generate SEO Metadata
+        seo_title = generate_seo_title(item)
+        seo_slug = generate_slug(item)
+        seo_description = generate_meta_description(item)
+        seo_labels = generate_labels(item) + warehouse.skill_labels(item)
+        
+        print(f"   > SEO Title: {seo_title}")
+        print(f"   > Slug: {seo_slug}")
+        print(f"   > Canonical: {generate_canonical_url(item)}")
+
+        scheduled_items.append(item)
+        posts.append({
+            "title": seo_title,
+            "html": html_content,
+            "labels": seo_labels,
+            "description": seo_description,
+            "slug": seo_slug,
+            "publish_date": publish_date_iso # 👈 NEW: Schedule the post
+        })
+
+    # Queued posts keep their content; only schedule times in the past move
+    for entry in reversed(plan.queued):
+        post = entry["post"]
+        if datetime.fromisoformat(post["publish_date"]) <= datetime.now().astimezone():
+            post["publish_date"] = plan.schedule_times(1)[0].astimezone().isoformat()
+        scheduled_items.insert(0, entry["item"])
+        posts.insert(0, post)
+
+    return scheduled_items, posts
+
+def publish_batch(blog_id, posts):
+    """publish_posts that never raises, so one blog cannot fail the others."""
+    try:
+        return publish_posts(blog_id, posts)
+    except Exception as e:
+        print(f"❌ Failed to send the publish batch for {blog_id}. Error: {e}")
+        # Posts that were already inserted must not be requeued
+        results = getattr(e, "results", None)
+        return results or [{"url": None, "error": e, "deferred": True} for _ in posts]
+
 # --- Main Execution Logic ---
 
-# 1. Initialize Blogger service and get existing titles
+# 1. Initialize Blogger service and sync every blog's duplicate index.
+# Posts deferred by earlier runs are picked up from the retry queue.
 service = blogger_service()
-existing_titles = get_existing_titles(service, TECKFY["blog_id"])
+retry_queue = quota.RetryQueue()
+plans = []
+for blog in blogs:
+    if not blog.get("enabled", True):
+        continue
+    plan = BlogPlan(blog, queued=retry_queue.pop_all(blog["blog_id"]))
+    plan.sync(service)
+    if plan.queued:
+        print(f"[{blog['name']}] {len(plan.queued)} posts deferred by earlier runs are waiting in the retry queue.")
+    plans.append(plan)
 
-# 2. Collect job titles from scraper
-print("Scraping new job listings from Workday sites...")
-# Only scrape and post Workday jobs as per request
-from workday_scraper import scrape_workday_jobs
-from content_builder import build_html_content
+# 2. Collect job titles from scraper (once, shared by every blog)
+print("Scraping new job listings from every enabled source (sources.json)...")
+from sources import load_sources, collect_jobs
+from content_builder import render_post, MIN_WORD_COUNT, DEFAULT_STYLE_MODE
 
-# Fetch jobs posted TODAY
-all_items = scrape_workday_jobs(limit=25) # Fetch a bit more to account for duplicates
+# Fetch jobs posted TODAY that earlier runs have not processed yet.
+# Fetch enough to fill every blog's quota after duplicates are dropped.
+total_quota = sum(plan.daily_quota for plan in plans)
+all_items = collect_jobs(load_sources(), limit=5 * total_quota)
+# Title-only sources (the WordPress sites) feed the AI article path, not the post template
+all_items = [item for item in all_items if item["description"]]
+# Keep every scraped job: history for backfills, exports and related posts
+warehouse = JobWarehouse()
+print(f"Stored {warehouse.upsert_jobs(all_items)} new jobs, the warehouse holds {len(warehouse)}.")
 
-# 3. Filter out duplicates by checking against the API data
-new_items = [item for item in all_items if not is_duplicate(item["title"], existing_titles)]
-print(f"Found {len(all_items)} total items, {len(new_items)} are new after duplicate check.")
+# 3. Assign jobs to blogs: per-blog duplicate and near-duplicate checks,
+# per-blog daily quotas (AdSense Optimized), within today's API budget.
+assigned, duplicates = plan_publishing(all_items, plans, quota.ledger.remaining("insert"), warehouse)
+# Workday postings count as processed once published or rejected as duplicates;
+# the rest (over quota, below the word gate, ...) are offered again next run
+processed = TenantWatermarks()
+processed.mark_jobs(duplicates)
+processed.save()
+print(f"Found {len(all_items)} total items, {assigned} assigned to {len(plans)} blogs.")
+for plan in plans:
+    print(f"[{plan.blog['name']}] Will attempt to post {len(plan.items)} new jobs today.")
 
-# 4. Limit to 5 posts per day (AdSense Optimized)
-max_posts = min(5, len(new_items))
-if max_posts == 0:
+if assigned == 0 and not any(plan.queued for plan in plans):
     print("No new jobs to post today. Exiting.")
     exit()
 
-# Randomly select items if there are more than max
-items_to_post = random.sample(new_items, max_posts) if len(new_items) > max_posts else new_items
-print(f"Will attempt to post {len(items_to_post)} jobs today.")
-
-# 5. Assign random posting times and SCHEDULE via API
-# Spreading posts over the NEXT 12 hours (e.g. 6am - 6pm IST)
+# 4. Build every blog's posts, with random publish times spread over
+# the blog's schedule window (e.g. the NEXT 12 hours, 6am - 6pm IST).
 # We assume the script runs once a day (e.g. at 6:00 AM IST)
-
 base_time = datetime.now()
 print(f"Current System Time: {base_time}")
+prepared = [prepare_posts(plan, base_time) for plan in plans]
 
-# Prepare a list of future times for today/tomorrow
-scheduled_times = []
-for _ in range(len(items_to_post)):
-    # Generate a random time offset between 10 minutes and 12 hours from now
-    # This ensures posts are spread out over the day
-    offset_minutes = random.randint(10, 720) 
-    scheduled_time = base_time + timedelta(minutes=offset_minutes)
-    scheduled_times.append(scheduled_time)
-
-scheduled_times.sort()
+# 5. SCHEDULE all blogs concurrently, one batch per blog. Spacing between
+# posts comes from the scheduled publish times, not from waiting.
+print("-" * 50)
+print(f"Scheduling {sum(len(posts) for _, posts in prepared)} posts on {len(plans)} blogs...")
+with ThreadPoolExecutor(max_workers=max(1, len(plans))) as pool:
+    all_results = list(pool.map(publish_batch, [plan.blog_id for plan in plans],
+                                [posts for _, posts in prepared]))
 
-# 6. Process and SCHEDULE each item
-for i, item in enumerate(items_to_post):
-    
-    publish_at = scheduled_times[i]
-    # Convert to ISO 8601 format required by Blogger API (RFC 3339)
-    # We must ensure it has timezone info. .astimezone() uses system local time.
-    publish_date_iso = publish_at.astimezone().isoformat()
-    
-    print("-" * 50)
-    print(f"Scheduling ({i+1}/{len(items_to_post)}): {item['title']} - {item['company']}")
-    print(f"   > Scheduled Time: {publish_at.astimezone().strftime('%Y-%m-%d %I:%M %p %Z')}")
+# 6. Record the outcome per blog
+for plan, (scheduled_items, posts), results in zip(plans, prepared, all_results):
+    for item, post, result in zip(scheduled_items, posts, results):
+        if result["deferred"]:
+            print(f"[{plan.blog['name']}] ⏳ Deferred to the next run: '{post['title']}'")
+            retry_queue.push(plan.blog_id, post, item)
+            # Published from the queue, so it must not be scraped again
+            processed.mark_jobs([item])
+            continue
+        if result["error"] is not None:
+            print(f"[{plan.blog['name']}] ❌ Failed to schedule post '{post['title']}'. Error: {result['error']}")
+            continue
 
-    # Build HTML content
-    try:
-        html_content = build_html_content(item)
-    except Exception as e:
-        print(f"Error building HTML for {item['title']}: {e}")
-        continue
-    
-    # 🚨 AdSense Gate: Check Word Count
-    text_content = re.sub(r'<[^>]+>', '', html_content)
-    word_count = len(text_content.split())
-    
-    if word_count < 900:
-        print(f"⚠️ Skipping post due to Low Word Count: {word_count} words (Minimum 900 required)")
-        continue
-    else:
-        print(f"✅ Word Count Pass: {word_count} words")
+        url = result["url"]
+        print(f"[{plan.blog['name']}] ✅ Successfully Scheduled: {url}")
 
-    # Generate SEO Metadata
-    from seo_utils import generate_seo_title, generate_slug, generate_meta_description, generate_labels
-    
-    seo_title = generate_seo_title(item)
-    seo_slug = generate_slug(item)
-    seo_description = generate_meta_description(item)
-    seo_labels = generate_labels(item)
-    
-    print(f"   > SEO Title: {seo_title}")
-    print(f"   > Slug: {seo_slug}")
+        # Add the new titles to the index to avoid duplicates within this and later runs
+        plan.dedup.add(item['title'])
+        plan.dedup.add(post['title'])
+        plan.near_duplicates.add(item)
+        warehouse.mark_published(item['apply_url'], plan.blog_id, url, generate_canonical_url(item))
+        processed.mark_jobs([item])
+        append_publish_log({
+            "title": post['title'],
+            "url": url,
+            "slug": post['slug'],
+            "canonical_url": generate_canonical_url(item),
+            "blog_id": plan.blog_id,
+            "date": datetime.now().isoformat()
+        })
 
-    try:
-        url = publish_post(
-            blog_id=TECKFY["blog_id"],
-            title=seo_title,
-            html=html_content,
-            labels=seo_labels,
-            description=seo_description,
-            slug=seo_slug,
-            publish_date=publish_date_iso # 👈 NEW: Schedule the post
-        )
-        print(f"✅ Successfully Scheduled: {url}")
-        
-        # Ping Sitemap (Deprecated/404)
-        # from seo_utils import ping_sitemap
-        # ping_sitemap()
-        
-        # Add the new title to our set to avoid potential duplicates within the same run
-        existing_titles.add(normalize_title(item['title']))
+    plan.dedup.save()
+    plan.near_duplicates.save()
+processed.save()
+retry_queue.save()
 
-    except Exception as e:
-        print(f"❌ Failed to schedule post '{seo_title}'. Error: {e}")
-    
-    # Valid 5-minute delay between API calls as requested
-    if i < len(items_to_post) - 1:
-        print("Waiting 5 minutes before scheduling next post...")
-        time.sleep(300)
+# 7. Add the new canonical URLs to the local sitemaps and feed (not deployed, see sitemap.py)
+try:
+    update_sitemaps()
+except Exception as e:
+    print(f"⚠️ Error updating sitemaps: {e}")
 
 print("-" * 50)
 print("Daily scheduling process completed. GitHub Action will exit now.")
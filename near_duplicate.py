@@ -0,0 +1,211 @@
+import base64
+import hashlib
+import random
+import re
+from array import array
+from dedup_index import normalize_title
+from disk_cache import load_state, update_state_entry
+
+SIGNATURES_FILE = "near_duplicates.json"
+# Bumped when the shingled title form changes; older title signatures are dropped
+TITLE_FORM = 2
+
+# MinHash signature length and LSH banding. With 16 bands of 4 rows a
+# pair with Jaccard similarity s becomes a candidate with probability
+# 1 - (1 - s^4)^16: ~99% at s=0.8, ~50% at s=0.5.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Estimated similarity above which a post counts as a near duplicate
+TITLE_THRESHOLD = 0.8
+DESCRIPTION_THRESHOLD = 0.85
+
+TITLE_SHINGLE = 4        # characters
+DESCRIPTION_SHINGLE = 5  # words
+
+# Titles that differ in any of these are different roles, however similar
+# the rest of the title is ("Engineer II" vs "Engineer III")
+LEVEL_WORDS = {"intern", "trainee", "junior", "jr", "associate", "senior", "sr", "lead", "staff",
+               "principal", "manager", "director", "head", "i", "ii", "iii", "iv", "v"}
+# "<company> <title> recruitment <year> – <location> | apply online", normalized
+SEO_TITLE_RE = re.compile(r'^(.*?)\s*\brecruitment\b.*\bapply online$')
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(1729)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERM)]
+
+def _hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+def title_text(item):
+    """The form titles are compared in: company and job title, normalized."""
+    return normalize_title(f"{item.get('company', '')} {item['title']}")
+
+def title_level(text):
+    return {word for word in text.split() if word in LEVEL_WORDS}
+
+def title_shingles(title):
+    """Character shingles of the normalized title."""
+    text = normalize_title(title)
+    if len(text) <= TITLE_SHINGLE:
+        return {text} if text else set()
+    return {text[i:i + TITLE_SHINGLE] for i in range(len(text) - TITLE_SHINGLE + 1)}
+
+def description_shingles(description_html):
+    """Word shingles of the job description with all markup stripped."""
+    text = re.sub(r'<[^>]+>', ' ', description_html or "")
+    words = re.findall(r'[a-z0-9]+', text.lower())
+    if len(words) <= DESCRIPTION_SHINGLE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + DESCRIPTION_SHINGLE]) for i in range(len(words) - DESCRIPTION_SHINGLE + 1)}
+
+def minhash(shingles):
+    """Returns the MinHash signature of a shingle set, or None if it is empty."""
+    if not shingles:
+        return None
+    hashes = [_hash(s) for s in shingles]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    )
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+def encode_signature(signature):
+    return base64.b64encode(array("I", signature).tobytes()).decode("ascii")
+
+def decode_signature(encoded):
+    values = array("I")
+    values.frombytes(base64.b64decode(encoded))
+    return tuple(values)
+
+class LSHIndex:
+    """
+    Locality sensitive hashing over MinHash signatures. Each signature is
+    split into BANDS bands and filed under one bucket per band, so a query
+    only compares against entries sharing at least one bucket.
+    """
+    def __init__(self):
+        self.signatures = {}
+        self._buckets = {}
+
+    def _bands(self, signature):
+        for band in range(BANDS):
+            yield band, signature[band * ROWS:(band + 1) * ROWS]
+
+    def add(self, key, signature):
+        self.signatures[key] = signature
+        for bucket in self._bands(signature):
+            self._buckets.setdefault(bucket, set()).add(key)
+
+    def query(self, signature, threshold, accept=None):
+        """
+        Returns (key, similarity) of the closest entry above `threshold`
+        whose key passes `accept` (if given), or None.
+        """
+        candidates = set()
+        for bucket in self._bands(signature):
+            candidates |= self._buckets.get(bucket, set())
+        best = None
+        for key in candidates:
+            if accept and not accept(key):
+                continue
+            score = similarity(signature, self.signatures[key])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (key, score)
+        return best
+
+    def __contains__(self, key):
+        return key in self.signatures
+
+    def __len__(self):
+        return len(self.signatures)
+
+class NearDuplicateDetector:
+    """
+    Finds posts that are near duplicates of ones already on a blog: the
+    same requisition slightly reworded by the tenant, or the same role
+    posted for several cities. Titles and descriptions are indexed
+    separately and either one matching is enough.
+
+    Titles are compared as company plus job title (title_text), without
+    the SEO boilerplate every post title shares, and never match across
+    role levels (LEVEL_WORDS).
+
+    Only entries added with persist=True (i.e. actually published) are
+    written to disk; the others only guard against duplicates in this run.
+    """
+    def __init__(self, blog_id, filename=SIGNATURES_FILE):
+        self.blog_id = blog_id
+        self.filename = filename
+        self.titles = LSHIndex()
+        self.descriptions = LSHIndex()
+        entry = load_state(filename, {}).get(blog_id, {"titles": {}, "descriptions": {}})
+        self._entry = entry
+        if entry.get("title_form") != TITLE_FORM:
+            # Signatures of an older title form; sync() reseeds the titles
+            entry.update({"title_form": TITLE_FORM, "titles": {}})
+        for key, encoded in entry["titles"].items():
+            self.titles.add(key, decode_signature(encoded))
+        for key, encoded in entry["descriptions"].items():
+            self.descriptions.add(key, decode_signature(encoded))
+
+    def add_titles(self, normalized_titles):
+        """
+        Indexes already normalized post titles, e.g. from the DedupIndex.
+        Only SEO post titles are used, cut down to their company and job
+        title; titles without a company cannot be compared in that form.
+        """
+        added = 0
+        for normalized in normalized_titles:
+            match = SEO_TITLE_RE.match(normalized)
+            title = match.group(1) if match else None
+            if not title or title in self.titles:
+                continue
+            signature = minhash(title_shingles(title))
+            if signature:
+                self.titles.add(title, signature)
+                self._entry["titles"][title] = encode_signature(signature)
+                added += 1
+        return added
+
+    def find(self, item):
+        """
+        Returns a short description of the post `item` duplicates, or None.
+        """
+        text = title_text(item)
+        title_sig = minhash(title_shingles(text))
+        if title_sig:
+            level = title_level(text)
+            match = self.titles.query(title_sig, TITLE_THRESHOLD, accept=lambda key: title_level(key) == level)
+            if match:
+                return f"title ~ '{match[0]}' ({match[1]:.0%})"
+        description_sig = minhash(description_shingles(item.get("description")))
+        if description_sig:
+            match = self.descriptions.query(description_sig, DESCRIPTION_THRESHOLD)
+            if match:
+                return f"description ~ '{match[0]}' ({match[1]:.0%})"
+        return None
+
+    def add(self, item, persist=True):
+        key = title_text(item)
+        title_sig = minhash(title_shingles(key))
+        description_sig = minhash(description_shingles(item.get("description")))
+        entry = self._entry
+        if title_sig:
+            self.titles.add(key, title_sig)
+            if persist:
+                entry["titles"][key] = encode_signature(title_sig)
+        if description_sig:
+            self.descriptions.add(key, description_sig)
+            if persist:
+                entry["descriptions"][key] = encode_signature(description_sig)
+
+    def save(self):
+        """Writes this blog's signatures; other blogs' entries in the file are kept."""
+        update_state_entry(self.filename, self.blog_id, self._entry)
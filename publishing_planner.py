@@ -0,0 +1,112 @@
+import random
+from datetime import datetime, timedelta
+from dedup_index import DedupIndex
+from near_duplicate import NearDuplicateDetector
+from seo_utils import generate_seo_title
+
+# Used for blogs.json entries that do not override them
+DEFAULT_DAILY_QUOTA = 5
+DEFAULT_SCHEDULE = {"min_delay_minutes": 10, "max_delay_minutes": 720}
+
+def is_duplicate(item: dict, index: DedupIndex) -> bool:
+    """
+    Checks if a job was already posted, either under its raw job title
+    or under the SEO title it would be published with.
+    """
+    return index.contains(item["title"]) or index.contains(generate_seo_title(item))
+
+class BlogPlan:
+    """
+    Per-blog publishing state for one run: the blog's duplicate indexes,
+    the posts carried over in the retry queue and the jobs assigned to it.
+    """
+    def __init__(self, blog, queued=None):
+        self.blog = blog
+        self.blog_id = blog["blog_id"]
+        self.daily_quota = blog.get("daily_quota", DEFAULT_DAILY_QUOTA)
+        self.schedule = {**DEFAULT_SCHEDULE, **blog.get("schedule", {})}
+        self.dedup = DedupIndex(self.blog_id)
+        self.near_duplicates = NearDuplicateDetector(self.blog_id)
+        self.queued = queued or []
+        self.items = []
+
+    def sync(self, service):
+        """Brings the duplicate indexes up to date with the blog."""
+        print(f"[{self.blog['name']}] Syncing existing posts from Blogger API to check for duplicates...")
+        try:
+            self.dedup.sync(service)
+        except Exception as e:
+            # If API fails, proceed with what the local index already knows
+            print(f"[{self.blog['name']}] Error syncing existing posts: {e}")
+        self.near_duplicates.add_titles(self.dedup.titles)
+
+    @property
+    def capacity(self):
+        """How many more new jobs this blog takes today."""
+        return max(0, self.daily_quota - len(self.queued) - len(self.items))
+
+    def rejects(self, item):
+        """Returns why `item` is a duplicate on this blog, or None."""
+        if is_duplicate(item, self.dedup):
+            return "duplicate"
+        return self.near_duplicates.find(item)
+
+    def assign(self, item):
+        self.items.append(item)
+        # Guards against near duplicates within this run; persisted on publish
+        self.near_duplicates.add(item, persist=False)
+
+    def schedule_times(self, count, base_time=None):
+        """Random, sorted publish times within the blog's schedule window."""
+        base_time = base_time or datetime.now()
+        times = [
+            base_time + timedelta(minutes=random.randint(self.schedule["min_delay_minutes"],
+                                                         self.schedule["max_delay_minutes"]))
+            for _ in range(count)
+        ]
+        return sorted(times)
+
+def plan_publishing(jobs, plans, insert_budget, warehouse=None):
+    """
+    Assigns each scraped job to at most one blog. Jobs the warehouse (a
+    JobWarehouse, optional) knows were published on any blog before are
+    skipped.
+
+    Jobs are taken in random order and offered to the blog with the most
+    spare capacity first; a blog takes a job only if it is not a duplicate
+    there and its daily quota allows. Across all blogs no more than
+    `insert_budget` posts (including queued ones) are planned.
+
+    Returns (assigned, duplicates): the number of jobs assigned, and the
+    jobs that were published before or that every blog rejected as a
+    duplicate. Jobs left over for lack of quota are in neither.
+    """
+    budget = insert_budget - sum(len(plan.queued) for plan in plans)
+    assigned = 0
+    duplicates = []
+    for item in random.sample(jobs, len(jobs)):
+        if budget <= 0:
+            break
+        if warehouse:
+            post_url = warehouse.published_elsewhere(item)
+            if post_url:
+                print(f"Skipping {item['title']} - {item['company']} (already published at {post_url})")
+                duplicates.append(item)
+                continue
+        rejected = 0
+        for plan in sorted(plans, key=lambda p: -p.capacity):
+            if plan.capacity == 0:
+                continue
+            reason = plan.rejects(item)
+            if reason:
+                print(f"[{plan.blog['name']}] Skipping {item['title']} - {item['company']} ({reason})")
+                rejected += 1
+                continue
+            plan.assign(item)
+            assigned += 1
+            budget -= 1
+            break
+        else:
+            if rejected == len(plans):
+                duplicates.append(item)
+    return assigned, duplicates
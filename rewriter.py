@@ -1,12 +1,53 @@
+import hashlib
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
+from disk_cache import DiskCache, cache_path
+from content_builder import STATIC_FRAGMENTS, SELECTION_STEPS, IMPORTANT_INSTRUCTIONS
+from formatter import markdown_to_html
 
 load_dotenv()
 
-# Initialize the client using the new SDK
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+TEMPERATURE = 0.7
+# Articles generated at once by rewrite_many, and Gemini calls in flight
+# across all of them (section-wise articles make several calls each)
+MAX_CONCURRENT = 4
+MAX_IN_FLIGHT = 8
+MAX_ATTEMPTS = 3
+
+# Generated articles, keyed by model, prompt and title
+ARTICLE_CACHE_FILE = "gemini_articles.sqlite3"
+ARTICLE_CACHE_TTL = 30 * 24 * 3600
+ARTICLE_CACHE_MAX_ENTRIES = 5000
+
+_client = None
+_client_lock = threading.Lock()
+_in_flight = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+_article_cache = None
+_article_cache_lock = threading.Lock()
+
+def get_client():
+    """Returns the Gemini client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        return _client
+
+def get_article_cache():
+    """Returns the process-wide article cache, opening it on first use."""
+    global _article_cache
+    with _article_cache_lock:
+        if _article_cache is None:
+            _article_cache = DiskCache(cache_path(ARTICLE_CACHE_FILE), ttl=ARTICLE_CACHE_TTL,
+                                       max_entries=ARTICLE_CACHE_MAX_ENTRIES)
+        return _article_cache
 
 PROMPT = """
 Write a completely ORIGINAL job information article.
@@ -30,16 +71,171 @@ Structure:
 - Disclaimer
 """
 
-def rewrite_content(title: str) -> str | None:
+def normalize_topic(title: str) -> str:
+    """Case and whitespace differences do not make a different article."""
+    return " ".join(title.lower().split())
+
+def article_cache_key(title: str, model=MODEL, prompt=PROMPT) -> str:
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+    return f"{model}:{prompt_hash}:{normalize_topic(title)}"
+
+def generate_text(contents: str, label: str, model=MODEL, on_chunk=None) -> str:
+    """
+    Streams one Gemini response, retrying transient failures with jittered
+    backoff. `on_chunk(label, text)` is called as each chunk arrives.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            parts = []
+            with _in_flight:
+                for chunk in get_client().models.generate_content_stream(
+                    model=model,
+                    contents=contents,
+                    config=types.GenerateContentConfig(
+                        temperature=TEMPERATURE,
+                    )
+                ):
+                    if chunk.text:
+                        parts.append(chunk.text)
+                        if on_chunk:
+                            on_chunk(label, chunk.text)
+            return "".join(parts).strip()
+        except Exception as e:
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = random.uniform(0, 2 ** (attempt + 1))
+            print(f"Gemini error for {label} ({e}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+def generate_article(title: str, model=MODEL) -> str:
+    return generate_text(f"Topic: {title}\n\n{PROMPT}", title, model)
+
+def rewrite_content(title: str, use_cache=True) -> str | None:
+    key = article_cache_key(title)
+    if use_cache:
+        cached = get_article_cache().get(key)
+        if cached is not None:
+            return cached
     try:
-        response = client.models.generate_content(
-            model="gemini-1.5-flash",
-            contents=f"Topic: {title}\n\n{PROMPT}",
-            config=types.GenerateContentConfig(
-                temperature=0.7,
-            )
-        )
-        return response.text.strip()
+        text = generate_article(title)
     except Exception as e:
         print(f"Error generating content for {title}: {e}")
         return None
+    if use_cache and text:
+        get_article_cache().set(key, text)
+    return text
+
+def rewrite_many(titles, max_workers=MAX_CONCURRENT, use_cache=True, sections=False):
+    """
+    Generates articles for many titles, at most `max_workers` at a time.
+    Titles already in the cache, and repeats within `titles`, cost no API
+    call. Returns the articles (or None on failure) in the order of `titles`:
+    markdown from rewrite_content, or HTML from rewrite_sections if
+    `sections` is set.
+    """
+    rewrite = rewrite_sections if sections else rewrite_content
+    cache = get_article_cache() if use_cache else None
+    hits_before, misses_before = (cache.hits, cache.misses) if cache else (0, 0)
+    unique = {}
+    for title in titles:
+        unique.setdefault(normalize_topic(title), title)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        articles = dict(zip(unique, pool.map(lambda title: rewrite(title, use_cache),
+                                             unique.values())))
+    if cache:
+        print(f"Generated {len(unique)} articles for {len(titles)} titles "
+              f"({cache.hits - hits_before} responses from cache, {cache.misses - misses_before} API requests).")
+    return [articles[normalize_topic(title)] for title in titles]
+
+# --- Section-wise articles ---
+# Each generated section is an independent, cached request, so an article
+# takes about as long as its slowest section and a failure costs only that
+# section. Boilerplate sections come from content_builder instead of the model.
+
+SECTION_RULES = """
+Rules:
+- DO NOT copy content from any website
+- DO NOT mention source websites
+- Use your own wording
+- Adsense safe
+- SEO friendly
+- Informational tone
+"""
+
+# (name, heading, instructions); the title section has no heading
+ARTICLE_SECTIONS = [
+    ("title", None, "Write one SEO friendly title for this article. Reply with the title only, without quotes or markdown."),
+    ("introduction", "Introduction", "Write a 120-150 word introduction to this job opportunity."),
+    ("details", "Key Job Details", "Write a markdown table with the columns Detail and Information covering the organization, post name, job location, qualification and salary. Write 'Not disclosed' for anything unknown."),
+    ("eligibility", "Eligibility", "Describe the eligibility criteria (education, experience, skills) as a short paragraph followed by a bullet list."),
+    ("selection", "Selection Process", None),
+    ("how_to_apply", "How to Apply", "Explain how to apply as a numbered list of 4-6 steps."),
+    ("dates", "Important Dates", "List the important dates as a bullet list. Write 'To be announced' for dates that are not known."),
+    ("instructions", "Important Instructions", None),
+    ("disclaimer", "Disclaimer", None),
+]
+
+FIXED_SECTIONS = {
+    "selection": "\n".join(f"- {step}" for step in SELECTION_STEPS),
+    "instructions": "\n".join(f"- {item}" for item in IMPORTANT_INSTRUCTIONS),
+    "disclaimer": ("This article is for information purposes only. We are not associated with the recruiting "
+                   "organization. Always apply through the official website and never pay anyone for a job."),
+}
+
+def section_prompt(heading, instructions):
+    if heading is None:
+        return f"{SECTION_RULES}\n{instructions}"
+    return (f"You are writing the '{heading}' section of an ORIGINAL job information article.\n"
+            f"{SECTION_RULES}\n{instructions}\n"
+            "Reply with the section content in markdown only, without the section heading.")
+
+def generate_section(title, name, heading, instructions, use_cache=True, on_chunk=None):
+    """Text of one generated section, from the cache when possible."""
+    prompt = section_prompt(heading, instructions)
+    key = article_cache_key(title, prompt=prompt)
+    if use_cache:
+        cached = get_article_cache().get(key)
+        if cached is not None:
+            return cached
+    text = generate_text(f"Topic: {title}\n\n{prompt}", f"{title} [{name}]", on_chunk=on_chunk)
+    if use_cache and text:
+        get_article_cache().set(key, text)
+    return text
+
+def author_bio_html():
+    # Markdown only passes raw HTML through when it starts at column 0
+    return "\n".join(line.strip() for line in STATIC_FRAGMENTS["AUTHOR_BIO"].strip().splitlines())
+
+def rewrite_sections(title: str, use_cache=True, on_chunk=None) -> str | None:
+    """
+    Generates an article one section per concurrent request and returns it
+    as HTML (via markdown_to_html), or None if a section kept failing.
+    Sections that did succeed are cached, so a retry only pays for the
+    failed ones.
+    """
+    generated = [(name, heading, instructions) for name, heading, instructions in ARTICLE_SECTIONS
+                 if name not in FIXED_SECTIONS]
+    texts = dict(FIXED_SECTIONS)
+    failed = []
+    with ThreadPoolExecutor(max_workers=len(generated)) as pool:
+        futures = {
+            name: pool.submit(generate_section, title, name, heading, instructions, use_cache, on_chunk)
+            for name, heading, instructions in generated
+        }
+        for name, future in futures.items():
+            try:
+                texts[name] = future.result()
+            except Exception as e:
+                print(f"Error generating the {name} section for {title}: {e}")
+                failed.append(name)
+    if failed:
+        return None
+
+    parts = []
+    for name, heading, _ in ARTICLE_SECTIONS:
+        if heading is None:
+            parts.append(f"# {texts[name].strip('#* ')}")
+        else:
+            parts.append(f"## {heading}\n\n{texts[name]}")
+    parts.append(author_bio_html())
+    return markdown_to_html("\n\n".join(parts))
@@ -1,39 +1,97 @@
-import requests
-from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
-def get_session():
-    session = requests.Session()
-    retry = Retry(connect=3, backoff_factor=0.5)
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
-    return session
+import threading
+from bs4 import BeautifulSoup, SoupStrainer
+from http_client import get_session, USER_AGENT
+from disk_cache import load_state, save_state
+
+# lxml builds the tree several times faster than html.parser; it is used
+# whenever it is installed.
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
 
 HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    "User-Agent": USER_AGENT
 }
 
-def scrape_offcampusjobs4u():
+# ETag / Last-Modified of each homepage and the titles parsed from it
+VALIDATORS_FILE = "scraper_validators.json"
+MAX_TITLES = 20
+
+# Only the `strainer` nodes are built into a tree; `selector` runs inside them
+SOURCES = {
+    "offcampusjobs4u": {
+        "url": "https://offcampusjobs4u.com/",
+        "strainer": SoupStrainer("article"),
+        "selector": "h2 a"
+    },
+    "job4freshers": {
+        "url": "https://job4freshers.co.in/",
+        "strainer": SoupStrainer("h2", class_="entry-title"),
+        "selector": "h2.entry-title a"
+    }
+}
+
+_validators = None
+_validators_lock = threading.Lock()
+
+def get_validators():
+    global _validators
+    with _validators_lock:
+        if _validators is None:
+            _validators = load_state(VALIDATORS_FILE, {})
+        return _validators
+
+def save_validators():
+    with _validators_lock:
+        if _validators is not None:
+            save_state(VALIDATORS_FILE, _validators)
+
+def parse_titles(html, strainer, selector):
+    soup = BeautifulSoup(html, PARSER, parse_only=strainer)
+    # Added check to ensure elements exist before accessing text
+    return [{"title": a.text.strip(), "url": a.get("href", "")} for a in soup.select(selector)[:MAX_TITLES] if a]
+
+def scrape_source(name):
+    """
+    Fetches a source's homepage with a conditional GET. When the server
+    answers 304 Not Modified the page is not parsed again and the titles
+    from the previous fetch are returned.
+    """
+    source = SOURCES[name]
+    validators = get_validators()
+    cached = validators.get(name, {})
+    headers = dict(HEADERS)
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
     try:
         session = get_session()
-        response = session.get("https://offcampusjobs4u.com/", headers=HEADERS, timeout=30)
+        response = session.get(source["url"], headers=headers, timeout=30)
+        if response.status_code == 304:
+            print(f"{name}: not modified since the last fetch.")
+            return cached.get("titles", [])
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        # Added check to ensure elements exist before accessing text
-        return [{"title": a.text.strip()} for a in soup.select("article h2 a")[:20] if a]
+        titles = parse_titles(response.content, source["strainer"], source["selector"])
+        with _validators_lock:
+            validators[name] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "titles": titles
+            }
+        return titles
     except Exception as e:
-        print(f"Error scraping offcampusjobs4u: {e}")
+        print(f"Error scraping {name}: {e}")
         return []
 
+def scrape_offcampusjobs4u():
+    titles = scrape_source("offcampusjobs4u")
+    save_validators()
+    return titles
+
 def scrape_job4freshers():
-    try:
-        session = get_session()
-        response = session.get("https://job4freshers.co.in/", headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        return [{"title": a.text.strip()} for a in soup.select("h2.entry-title a")[:20] if a]
-    except Exception as e:
-        print(f"Error scraping job4freshers: {e}")
-        return []
+    titles = scrape_source("job4freshers")
+    save_validators()
+    return titles
@@ -1,8 +1,11 @@
 import re
-import requests
 import json
 import random
 from datetime import datetime
+from html import escape
+
+# Canonical home of every post (the blogs publish under this domain)
+SITE_URL = "https://www.firstjobtech.in"
 
 # --- Role-Based Content Templates ---
 ROLE_TEMPLATES = {
@@ -100,6 +103,13 @@ def generate_slug(job_data):
     # Convert to lowercase and replace spaces with hyphens
     return slug.lower().strip().replace(" ", "-")
 
+def generate_canonical_url(job_data):
+    """
+    The post's canonical URL on the main site, as used in the meta tags,
+    the publish log and the sitemaps.
+    """
+    return f"{SITE_URL}/{generate_slug(job_data)}"
+
 def generate_meta_description(job_data):
     """
     Generates a high-CTR meta description.
@@ -144,13 +154,15 @@ def generate_breadcrumb(job_data):
     return f"Home &gt; IT Jobs &gt; {job_data['company']} Recruitment"
 
 
-def generate_role_based_prep_guide(job_data):
+def generate_role_based_prep_guide(job_data, selected_tips=None, rng=random):
     """
-    Generates a role-specific preparation guide using randomized templates.
+    Generates a role-specific preparation guide using randomized templates
+    (picked with `rng`), or the given `selected_tips`.
     """
     role = get_role_category(job_data['title'])
     tips = ROLE_TEMPLATES.get(role, ROLE_TEMPLATES["General"])["prep_tips"]
-    selected_tips = random.sample(tips, min(3, len(tips)))
+    if selected_tips is None:
+        selected_tips = rng.sample(tips, min(3, len(tips)))
     
     html = f"""
     <div class="prep-guide-section">
@@ -166,13 +178,15 @@ def generate_role_based_prep_guide(job_data):
     """
     return html
 
-def generate_career_growth_section(job_data):
+def generate_career_growth_section(job_data, selected_points=None, rng=random):
     """
-    Generates a high-value 'Why This Role' section.
+    Generates a high-value 'Why This Role' section (with points picked
+    with `rng`, or the given `selected_points`).
     """
     role = get_role_category(job_data['title'])
     points = ROLE_TEMPLATES.get(role, ROLE_TEMPLATES["General"])["career_growth"]
-    selected_points = random.sample(points, min(2, len(points)))
+    if selected_points is None:
+        selected_points = rng.sample(points, min(2, len(points)))
     year = get_current_year()
     
     html = f"""
@@ -226,13 +240,19 @@ def generate_summary(job_data):
 
 def generate_related_block(job_data):
     """
-    Generates an internal linking block for SEO.
+    Generates an internal linking block for SEO. Similar posts published
+    before (job_data["related_posts"], from the job warehouse) are linked
+    first.
     """
     year = get_current_year()
+    related = "".join(
+        f"\n        <li>👉 <a href='{escape(post['url'])}'>{escape(post['title'])}</a></li>"
+        for post in job_data.get("related_posts", [])
+    )
     return f"""
 <div class="related-jobs-block">
     <h3>Latest IT Jobs {year}</h3>
-    <ul>
+    <ul>{related}
         <li>👉 <a href='/search/label/IT Jobs {year}'>More IT Jobs {year}</a></li>
         <li>👉 <a href='/search/label/{job_data['location']}'>Jobs in {job_data['location']}</a></li>
         <li>👉 <a href='/search/label/{job_data['company']}'>More {job_data['company']} Jobs</a></li>
@@ -301,7 +321,7 @@ def generate_meta_tags(job_data):
     <meta property="og:locale" content="en_IN" />
     <meta name="twitter:card" content="summary_large_image" />
     <meta name="twitter:site" content="@FirstJobTech" />
-    <link rel="canonical" href="https://www.firstjobtech.in/{generate_slug(job_data)}" />
+    <link rel="canonical" href="{generate_canonical_url(job_data)}" />
     <meta name="theme-color" content="#1a73e8" />
     <meta name="apple-mobile-web-app-capable" content="yes" />
     <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent" />
@@ -336,17 +356,3 @@ def generate_hashtags(job_data):
         "#ApplyNow"
     ]
     return ' '.join(hashtags)
-
-def ping_sitemap(sitemap_url="https://www.firstjobtech.in/sitemap.xml"):
-    """
-    Pings Google with the sitemap URL to speed up indexing.
-    """
-    ping_url = f"https://www.google.com/ping?sitemap={sitemap_url}"
-    try:
-        response = requests.get(ping_url)
-        if response.status_code == 200:
-            print(f"✅ Successfully pinged Google Sitemap: {sitemap_url}")
-        else:
-            print(f"⚠️ Failed to ping sitemap. Status Code: {response.status_code}")
-    except Exception as e:
-        print(f"⚠️ Error pinging sitemap: {e}")
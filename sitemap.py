@@ -0,0 +1,233 @@
+import codecs
+import json
+import os
+from collections import deque
+from datetime import datetime
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+from dedup_index import publish_log_path
+from seo_utils import SITE_URL
+
+# Sitemaps and their state live together, so they can only be lost together.
+# They are not served from SITE_URL yet: the workflow keeps the directory in
+# its cache and uploads the XML files as the "sitemaps" run artifact, so the
+# <loc> URLs of the index only resolve once the files are hosted there.
+SITEMAP_DIR = os.getenv("SITEMAP_DIR", "site")
+STATE_FILE = "sitemap_state.json"
+INDEX_FILE = "sitemap.xml"
+FEED_FILE = "feed.xml"
+SHARD_NAME = "sitemap-{}.xml"
+
+# Protocol limits per sitemap file
+MAX_URLS_PER_SHARD = 50000
+MAX_SHARD_BYTES = 50 * 1024 * 1024
+FEED_SIZE = 50
+READ_CHUNK = 64 * 1024
+
+URLSET_OPEN = b'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = b'</urlset>\n'
+
+def iter_log_entries(path, offset=0):
+    """
+    Streams the entries of a JSON array file (the publish log) starting at
+    byte `offset`, which must be 0 or an offset this generator yielded.
+    Yields (entry, offset just past the entry); memory use is bounded by
+    READ_CHUNK plus the largest entry, however long the log gets.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        f.seek(offset)
+        buffer = ""
+        position = offset
+        eof = False
+        while True:
+            stripped = buffer.lstrip(" \t\r\n,[")
+            position += len(buffer[:len(buffer) - len(stripped)].encode("utf-8"))
+            buffer = stripped
+            if buffer.startswith("]"):
+                return
+            try:
+                if not buffer:
+                    raise ValueError("need more data")
+                entry, end = decoder.raw_decode(buffer)
+            except ValueError:
+                if eof:
+                    return
+                chunk = f.read(READ_CHUNK)
+                eof = not chunk
+                buffer += text_decoder.decode(chunk, final=eof)
+                continue
+            position += len(buffer[:end].encode("utf-8"))
+            buffer = buffer[end:]
+            yield entry, position
+
+def entry_key(entry):
+    """Identifies a publish log entry, to check the log still holds what was read."""
+    return f"{entry.get('date')} {entry.get('canonical_url') or entry.get('url')}"
+
+def entry_url(entry):
+    """The firstjobtech.in URL of a publish log entry, or None."""
+    url = entry.get("canonical_url") or entry.get("url") or ""
+    # Entries logged before canonical URLs only have the blogspot address
+    return url if url.startswith(SITE_URL) else None
+
+class SitemapWriter:
+    """
+    Keeps sharded sitemap-N.xml files, a sitemap index and an RSS feed in
+    step with the publish log, reading only the entries logged since the
+    last update.
+
+    New URLs are appended to the newest shard in place (its closing tag is
+    overwritten); a new shard is started when one reaches the URL or byte
+    limit. Only the index and the short feed are rewritten on every update.
+
+    The state records the offset and key of the last entry read, so an
+    update resumes only if that same entry still ends at the stored
+    offset; a replaced or rewritten log rebuilds the sitemaps from scratch.
+    """
+    def __init__(self, directory=SITEMAP_DIR, log_path=None):
+        self.directory = directory
+        self.log_path = log_path or publish_log_path()
+        self.state_path = os.path.join(directory, STATE_FILE)
+        os.makedirs(directory, exist_ok=True)
+        self.state = {"log_offset": 0, "last_entry": None, "shards": [], "recent": []}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        self.recent = deque(self.state["recent"], maxlen=FEED_SIZE)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _reset(self):
+        """Forgets everything written so far, e.g. when the log was replaced."""
+        for shard in self.state["shards"]:
+            if os.path.exists(self._path(shard["name"])):
+                os.remove(self._path(shard["name"]))
+        self.state = {"log_offset": 0, "last_entry": None, "shards": [], "recent": []}
+        self.recent.clear()
+
+    def _resumable(self):
+        """Whether the log still continues from where the last update stopped."""
+        offset = self.state["log_offset"]
+        if offset == 0:
+            return True
+        if os.path.getsize(self.log_path) < offset:
+            return False
+        last = self.state.get("last_entry")
+        if not last:
+            # State from before entries were keyed; trust the offset
+            return True
+        for entry, end in iter_log_entries(self.log_path, last["offset"]):
+            return end == offset and entry_key(entry) == last["key"]
+        return False
+
+    def _open_shard(self):
+        """Returns the newest shard opened for appending, positioned before </urlset>."""
+        shards = self.state["shards"]
+        if shards:
+            shard = shards[-1]
+            path = self._path(shard["name"])
+            if (shard["urls"] < MAX_URLS_PER_SHARD and os.path.exists(path)
+                    and os.path.getsize(path) < MAX_SHARD_BYTES - 1024):
+                f = open(path, "r+b")
+                f.seek(-len(URLSET_CLOSE), os.SEEK_END)
+                if f.read() == URLSET_CLOSE:
+                    f.seek(-len(URLSET_CLOSE), os.SEEK_END)
+                    f.truncate()
+                    return shard, f
+                f.close()
+        shard = {"name": SHARD_NAME.format(len(shards) + 1), "urls": 0, "lastmod": None}
+        shards.append(shard)
+        f = open(self._path(shard["name"]), "wb")
+        f.write(URLSET_OPEN)
+        return shard, f
+
+    def update(self):
+        """Appends URLs logged since the last update. Returns how many were added."""
+        if not os.path.exists(self.log_path):
+            return 0
+        if not self._resumable():
+            print("Publish log does not continue where the sitemaps left off, rebuilding them...")
+            self._reset()
+
+        added = 0
+        shard, f = None, None
+        try:
+            for entry, offset in iter_log_entries(self.log_path, self.state["log_offset"]):
+                self.state["last_entry"] = {"offset": self.state["log_offset"], "key": entry_key(entry)}
+                self.state["log_offset"] = offset
+                url = entry_url(entry)
+                if not url:
+                    continue
+                lastmod = entry.get("date", datetime.now().isoformat())[:10]
+                record = f"<url><loc>{escape(url)}</loc><lastmod>{lastmod}</lastmod></url>\n".encode("utf-8")
+                if shard is None or shard["urls"] >= MAX_URLS_PER_SHARD \
+                        or f.tell() + len(record) + len(URLSET_CLOSE) > MAX_SHARD_BYTES:
+                    if f:
+                        f.write(URLSET_CLOSE)
+                        f.close()
+                    shard, f = self._open_shard()
+                f.write(record)
+                shard["urls"] += 1
+                shard["lastmod"] = max(shard["lastmod"] or lastmod, lastmod)
+                self.recent.append({"title": entry.get("title", url), "url": url, "date": entry.get("date")})
+                added += 1
+        finally:
+            if f:
+                f.write(URLSET_CLOSE)
+                f.close()
+
+        self.write_index()
+        self.write_feed()
+        self.save()
+        return added
+
+    def write_index(self):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        for shard in self.state["shards"]:
+            lines.append(f"<sitemap><loc>{SITE_URL}/{shard['name']}</loc>"
+                         f"<lastmod>{shard['lastmod']}</lastmod></sitemap>")
+        lines.append("</sitemapindex>")
+        self._write(INDEX_FILE, "\n".join(lines) + "\n")
+
+    def write_feed(self):
+        """RSS 2.0 feed of the FEED_SIZE most recently published posts, newest first."""
+        items = []
+        for post in reversed(self.recent):
+            published = ""
+            if post.get("date"):
+                published = f"<pubDate>{format_datetime(datetime.fromisoformat(post['date']).astimezone())}</pubDate>"
+            items.append(f"<item><title>{escape(post['title'])}</title><link>{escape(post['url'])}</link>"
+                         f"<guid>{escape(post['url'])}</guid>{published}</item>")
+        feed = ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>\n'
+                f"<title>FirstJobTech</title><link>{SITE_URL}</link>"
+                "<description>Latest IT jobs in India</description>\n"
+                + "\n".join(items) + "\n</channel></rss>\n")
+        self._write(FEED_FILE, feed)
+
+    def _write(self, name, content):
+        tmp_path = self._path(name) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, self._path(name))
+
+    def save(self):
+        self.state["recent"] = list(self.recent)
+        self._write(STATE_FILE, json.dumps(self.state, indent=2))
+
+def update_sitemaps(directory=SITEMAP_DIR):
+    """
+    Brings the sitemaps and feed in `directory` up to date with the
+    publish log. Only writes the files; nothing here deploys them.
+    """
+    writer = SitemapWriter(directory)
+    added = writer.update()
+    total = sum(shard["urls"] for shard in writer.state["shards"])
+    print(f"Sitemaps updated: {added} new URLs, {total} in {len(writer.state['shards'])} shards.")
+    return added
+
+if __name__ == "__main__":
+    update_sitemaps()
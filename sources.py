@@ -0,0 +1,214 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from datetime import datetime, timezone
+from html import unescape
+from http_client import get_session
+
+# Which sources to scan, with their adapter type and options
+SOURCES_FILE = "sources.json"
+# Seconds a source may take before its results are left out of the run
+DEFAULT_TIME_BUDGET = 300
+
+# Fields every normalized job carries (see normalize_job)
+JOB_FIELDS = ("title", "company", "company_url", "description", "location",
+              "posted_on", "posted_age_days", "apply_url", "logo")
+
+def company_logo(name):
+    return f"https://logos-api.apistemic.com/domain:{name.replace(' ', '').lower()}.com"
+
+def posted_on_text(age_days, posted_at):
+    """Workday style postedOn text, which the post templates expect."""
+    if age_days == 0:
+        return "Posted Today"
+    return posted_at.strftime('%d %B %Y')
+
+def normalize_job(job, source_name):
+    """Fills in missing JOB_FIELDS and tags the job with its source."""
+    normalized = {field: job.get(field, "") for field in JOB_FIELDS}
+    normalized["posted_age_days"] = job.get("posted_age_days")
+    if not normalized["logo"] and normalized["company"]:
+        normalized["logo"] = company_logo(normalized["company"])
+    normalized["source"] = source_name
+    # Workday jobs are marked processed only once the caller has used them
+    if job.get("watermark"):
+        normalized["watermark"] = job["watermark"]
+    return normalized
+
+class Source:
+    """
+    A job source. Subclasses implement fetch(limit), returning job dicts
+    with (some of) JOB_FIELDS. JSON based sources can be pointed at a
+    local `fixture_path` instead of the network.
+    """
+    def __init__(self, name, time_budget=DEFAULT_TIME_BUDGET, fixture_path=None, **options):
+        self.name = name
+        self.time_budget = time_budget
+        self.fixture_path = fixture_path
+        self.options = options
+        # Set by collect_jobs when the source runs out of time
+        self.cancelled = threading.Event()
+
+    def fetch(self, limit):
+        raise NotImplementedError
+
+    def get_json(self, url, params=None):
+        if self.fixture_path:
+            with open(self.fixture_path, encoding="utf-8") as f:
+                return json.load(f)
+        response = get_session().get(url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def keep(self, location, age_days):
+        """Applies the Workday job filter and age window to ATS postings."""
+        from workday_scraper import matches_location
+        max_age_days = self.options.get("max_age_days", 0)
+        return matches_location(location) and age_days is not None and age_days <= max_age_days
+
+class WorkdaySource(Source):
+    """Every tenant in tenants.json, scanned by workday_scraper."""
+    def fetch(self, limit):
+        from workday_scraper import scrape_workday_jobs
+        return scrape_workday_jobs(limit=limit, max_age_days=self.options.get("max_age_days", 0),
+                                   incremental=self.options.get("incremental", True),
+                                   cancelled=self.cancelled)
+
+class WordPressSource(Source):
+    """
+    Homepage titles of a WordPress job blog (see scraper.SOURCES). These
+    carry no job details, so they feed the AI article path rather than
+    the job post template.
+    """
+    def fetch(self, limit):
+        from scraper import scrape_source, save_validators
+        titles = scrape_source(self.options.get("site", self.name))
+        save_validators()
+        return [{"title": t["title"], "apply_url": t.get("url", "")} for t in titles[:limit]]
+
+class GreenhouseSource(Source):
+    """Published jobs of a Greenhouse job board (`board_token`)."""
+    API_URL = "https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs"
+
+    def fetch(self, limit):
+        data = self.get_json(self.API_URL.format(board_token=self.options["board_token"]),
+                             params={"content": "true"})
+        company = self.options.get("company", self.options["board_token"])
+        now = datetime.now(timezone.utc)
+        jobs = []
+        for posting in data.get("jobs", []):
+            location = (posting.get("location") or {}).get("name", "")
+            # updated_at moves on every edit, so an old posting would look new
+            posted_at = datetime.fromisoformat(posting.get("first_published") or posting["updated_at"])
+            age_days = (now - posted_at).days
+            if not self.keep(location, age_days):
+                continue
+            jobs.append({
+                "title": posting["title"],
+                "company": company,
+                "company_url": self.options.get("company_url", ""),
+                # The board API returns the description HTML escaped
+                "description": unescape(posting.get("content", "")),
+                "location": location,
+                "posted_on": posted_on_text(age_days, posted_at),
+                "posted_age_days": age_days,
+                "apply_url": posting["absolute_url"]
+            })
+            if len(jobs) >= limit:
+                break
+        return jobs
+
+class LeverSource(Source):
+    """Published postings of a Lever site (`site`)."""
+    API_URL = "https://api.lever.co/v0/postings/{site}"
+
+    def fetch(self, limit):
+        data = self.get_json(self.API_URL.format(site=self.options["site"]), params={"mode": "json"})
+        company = self.options.get("company", self.options["site"])
+        now = datetime.now(timezone.utc)
+        jobs = []
+        for posting in data:
+            location = (posting.get("categories") or {}).get("location", "")
+            posted_at = datetime.fromtimestamp(posting["createdAt"] / 1000, timezone.utc)
+            age_days = (now - posted_at).days
+            if not self.keep(location, age_days):
+                continue
+            sections = "".join(f"<h3>{section['text']}</h3><ul>{section['content']}</ul>"
+                               for section in posting.get("lists", []))
+            jobs.append({
+                "title": posting["text"],
+                "company": company,
+                "company_url": self.options.get("company_url", ""),
+                "description": posting.get("description", "") + sections + posting.get("additional", ""),
+                "location": location,
+                "posted_on": posted_on_text(age_days, posted_at),
+                "posted_age_days": age_days,
+                "apply_url": posting["hostedUrl"]
+            })
+            if len(jobs) >= limit:
+                break
+        return jobs
+
+# sources.json "type" -> adapter
+ADAPTERS = {
+    "workday": WorkdaySource,
+    "wordpress": WordPressSource,
+    "greenhouse": GreenhouseSource,
+    "lever": LeverSource
+}
+
+def load_sources(path=SOURCES_FILE):
+    """Builds the enabled sources from sources.json."""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    sources = []
+    for entry in entries:
+        entry = dict(entry)
+        if not entry.pop("enabled", True):
+            continue
+        kind = entry.pop("type")
+        if kind not in ADAPTERS:
+            print(f"Skipping source {entry.get('name')}: unknown type {kind!r}")
+            continue
+        sources.append(ADAPTERS[kind](**entry))
+    return sources
+
+def collect_jobs(sources, limit):
+    """
+    Fetches every source in parallel and merges their jobs into one list
+    of normalized jobs, in source order, without repeated apply URLs.
+
+    Each source gets up to `limit` jobs and its own time budget, counted
+    from the start of the fan-out: a source that is still running when its
+    budget is up is left out of this run and told to stop (its `cancelled`
+    event is set), so one slow source cannot hold up the others and the
+    run takes about as long as the slowest source within budget.
+    """
+    started = time.time()
+    pool = ThreadPoolExecutor(max_workers=max(1, len(sources)))
+    futures = [pool.submit(source.fetch, limit) for source in sources]
+    jobs = []
+    seen_urls = set()
+    for source, future in zip(sources, futures):
+        remaining = max(0, started + source.time_budget - time.time())
+        try:
+            found = future.result(timeout=remaining)
+        except TimeoutError:
+            source.cancelled.set()
+            print(f"Source {source.name} exceeded its {source.time_budget}s budget, skipping it this run.")
+            continue
+        except Exception as e:
+            print(f"Error collecting jobs from {source.name}: {e}")
+            continue
+        kept = 0
+        for job in found:
+            job = normalize_job(job, source.name)
+            if job["apply_url"] and job["apply_url"] in seen_urls:
+                continue
+            seen_urls.add(job["apply_url"])
+            jobs.append(job)
+            kept += 1
+        print(f"Source {source.name}: {kept} jobs (collected after {time.time() - started:.1f}s)")
+    pool.shutdown(wait=False, cancel_futures=True)
+    return jobs
@@ -0,0 +1,100 @@
+import threading
+import time
+from datetime import datetime
+from disk_cache import load_state, save_state
+
+HEALTH_FILE = "tenant_health.json"
+
+# A tenant's circuit opens after this many failures in a row.
+FAILURE_THRESHOLD = 2
+# Cool-off after the circuit opens; doubles with every further failed probe.
+BASE_COOL_OFF = 12 * 3600
+MAX_COOL_OFF = 14 * 24 * 3600
+# Weight of the newest sample in the latency moving average.
+LATENCY_ALPHA = 0.3
+
+class TenantHealth:
+    """
+    Persisted health registry with a circuit breaker per tenant.
+
+    Every search is recorded with its latency and outcome. After
+    FAILURE_THRESHOLD consecutive failures the tenant's circuit opens and
+    it is skipped until the cool-off expires; the next run after that
+    sends a single probe, which either closes the circuit again or
+    reopens it with twice the cool-off. Safe to update from several threads.
+    """
+    def __init__(self, filename=HEALTH_FILE):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._state = load_state(filename, {})
+
+    def _entry(self, key):
+        return self._state.setdefault(key, {
+            "name": key,
+            "requests": 0,
+            "failures": 0,
+            "consecutive_failures": 0,
+            "latency_ms": None,
+            "open_until": 0,
+            "last_error": None,
+            "last_checked": None
+        })
+
+    def allow(self, key):
+        """Returns False while the tenant's circuit is open."""
+        with self._lock:
+            entry = self._state.get(key)
+            return entry is None or time.time() >= entry["open_until"]
+
+    def _record(self, key, name, latency):
+        entry = self._entry(key)
+        entry["name"] = name or entry["name"]
+        entry["requests"] += 1
+        entry["last_checked"] = datetime.now().isoformat()
+        latency_ms = round(latency * 1000)
+        if entry["latency_ms"] is None:
+            entry["latency_ms"] = latency_ms
+        else:
+            entry["latency_ms"] = round(LATENCY_ALPHA * latency_ms + (1 - LATENCY_ALPHA) * entry["latency_ms"])
+        return entry
+
+    def record_success(self, key, latency, name=None):
+        with self._lock:
+            entry = self._record(key, name, latency)
+            entry["consecutive_failures"] = 0
+            entry["open_until"] = 0
+
+    def record_failure(self, key, latency, error, name=None):
+        with self._lock:
+            entry = self._record(key, name, latency)
+            entry["failures"] += 1
+            entry["consecutive_failures"] += 1
+            entry["last_error"] = str(error)
+            overflow = entry["consecutive_failures"] - FAILURE_THRESHOLD
+            if overflow >= 0:
+                cool_off = min(BASE_COOL_OFF * (2 ** overflow), MAX_COOL_OFF)
+                entry["open_until"] = time.time() + cool_off
+
+    def print_summary(self):
+        """Prints the open circuits and the tenants that failed recently."""
+        now = time.time()
+        with self._lock:
+            entries = sorted(self._state.values(), key=lambda e: -e["consecutive_failures"])
+        failing = [e for e in entries if e["consecutive_failures"]]
+        if not failing:
+            print("Tenant health: all tenants healthy.")
+            return
+        print(f"Tenant health: {len(failing)} tenants failing")
+        for entry in failing:
+            error_rate = entry["failures"] / max(entry["requests"], 1)
+            if entry["open_until"] > now:
+                reopens = datetime.fromtimestamp(entry["open_until"]).strftime('%Y-%m-%d %H:%M')
+                state = f"circuit open until {reopens}"
+            else:
+                state = "circuit closed"
+            print(f"   - {entry['name']}: {entry['consecutive_failures']} failures in a row, "
+                  f"error rate {error_rate:.0%}, {state} (last error: {entry['last_error']})")
+
+    def save(self):
+        with self._lock:
+            save_state(self.filename, self._state)
@@ -0,0 +1,166 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+from http_client import get_session
+from disk_cache import cache_path
+
+# Hand-maintained list of Workday career sites: [{"name": ..., "url": ...}],
+# next to this module wherever the scraper is run from
+REGISTRY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tenants.json")
+# Cache file with the same entries, their resolved CXS endpoint and the
+# result of the probe. Written by `python tenant_registry.py compile`, and
+# by load_companies() whenever tenants.json no longer matches it.
+COMPILED_FILE = "tenants.compiled.json"
+
+PROBE_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+}
+PROBE_WORKERS = 16
+
+# Career site URLs often carry a locale segment, e.g. /en-US/AccentureCareers
+LOCALE_SEGMENT = re.compile(r'^[a-z]{2}-[a-z]{2}$', re.IGNORECASE)
+
+def parse_tenant_url(url):
+    """
+    Extracts host, tenant and site from a Workday career site URL.
+
+    Supported patterns:
+        https://<tenant>.wdN.myworkdayjobs.com/[<locale>/]<site>[/...]
+        https://wdN.myworkdaysite.com/[<locale>/]recruiting/<tenant>/<site>[/...]
+    Returns (None, None, None) if the URL does not match either.
+    """
+    parsed = urlparse(url)
+    host = parsed.netloc
+    segments = [s for s in parsed.path.split("/") if s]
+    if segments and LOCALE_SEGMENT.match(segments[0]):
+        segments = segments[1:]
+    if not host or not segments:
+        return None, None, None
+
+    if host.endswith("myworkdaysite.com"):
+        if len(segments) < 3 or segments[0] != "recruiting":
+            return None, None, None
+        return host, segments[1], segments[2]
+
+    # <tenant>.wdN.myworkdayjobs.com/<site>; anything after the site
+    # (e.g. /1/refreshFacet/<id> or a trailing slash) is not part of it
+    return host, host.split(".")[0], segments[0]
+
+def compile_entry(entry):
+    """Resolves a registry entry into its canonical endpoints."""
+    host, tenant, site = parse_tenant_url(entry["url"])
+    compiled = {"name": entry["name"], "url": entry["url"]}
+    if not host:
+        compiled.update({"status": "invalid", "error": "unrecognised Workday URL"})
+        return compiled
+
+    if host.endswith("myworkdaysite.com"):
+        board_url = f"https://{host}/recruiting/{tenant}/{site}"
+    else:
+        board_url = f"https://{host}/{site}"
+    compiled.update({
+        "host": host,
+        "tenant": tenant,
+        "site": site,
+        "endpoint": f"https://{host}/wday/cxs/{tenant}/{site}/jobs",
+        "board_url": board_url,
+        "status": "ok"
+    })
+    return compiled
+
+def probe_entry(compiled):
+    """
+    Sends a one-posting search to the compiled endpoint and records the
+    result. A failed probe marks the entry "unreachable", which is only
+    reported: the tenant is still scanned, and failures at scrape time are
+    left to the circuit breaker in tenant_health.py.
+    """
+    if compiled["status"] != "ok":
+        return compiled
+    payload = {"appliedFacets": {}, "limit": 1, "offset": 0, "searchText": ""}
+    try:
+        resp = get_session().post(compiled["endpoint"], headers=PROBE_HEADERS, json=payload, timeout=15)
+        if resp.status_code != 200:
+            compiled.update({"status": "unreachable", "error": f"API Error {resp.status_code}"})
+        elif "jobPostings" not in resp.json():
+            compiled.update({"status": "unreachable", "error": "response has no jobPostings"})
+    except Exception as e:
+        compiled.update({"status": "unreachable", "error": str(e)})
+    compiled["checked_at"] = datetime.now().isoformat()
+    return compiled
+
+def load_registry(path=REGISTRY_FILE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def registry_digest(path=REGISTRY_FILE):
+    """Hash of the registry file, so a stale compiled file can be spotted."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def compile_registry(probe=True, registry_path=REGISTRY_FILE, compiled_path=None):
+    """
+    Resolves (and optionally probes) every registry entry and writes the
+    result to the compiled file. Returns the compiled entries.
+    """
+    compiled_path = compiled_path or cache_path(COMPILED_FILE)
+    compiled = [compile_entry(entry) for entry in load_registry(registry_path)]
+    if probe:
+        with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as pool:
+            compiled = list(pool.map(probe_entry, compiled))
+
+    with open(compiled_path, "w", encoding="utf-8") as f:
+        json.dump({"registry": registry_digest(registry_path), "tenants": compiled},
+                  f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    problems = [c for c in compiled if c["status"] != "ok"]
+    invalid = sum(1 for c in problems if c["status"] == "invalid")
+    print(f"Compiled {len(compiled)} tenants into {compiled_path}, "
+          f"{invalid} invalid, {len(problems) - invalid} unreachable.")
+    for c in problems:
+        print(f"   - {c['name']}: {c['status']}, {c['error']} ({c['url']})")
+    return compiled
+
+def load_companies(registry_path=REGISTRY_FILE, compiled_path=None):
+    """
+    Returns the tenants to scan, each with host/tenant/site/endpoint/board_url.
+    Uses the compiled registry, compiling it first when it is missing or
+    tenants.json has changed since. Only entries whose URL could not be
+    parsed are dropped; unreachable ones are still scanned.
+    """
+    compiled_path = compiled_path or cache_path(COMPILED_FILE)
+    compiled = None
+    if os.path.exists(compiled_path):
+        with open(compiled_path, encoding="utf-8") as f:
+            state = json.load(f)
+        if isinstance(state, dict) and state.get("registry") == registry_digest(registry_path):
+            compiled = state["tenants"]
+    if compiled is None:
+        print(f"{os.path.basename(compiled_path)} is missing or older than tenants.json, compiling it...")
+        compiled = compile_registry(probe=True, registry_path=registry_path, compiled_path=compiled_path)
+    return [c for c in compiled if c["status"] != "invalid"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate and compile the Workday tenant registry.")
+    parser.add_argument("command", choices=["compile", "check"],
+                        help="compile: resolve + probe and write the compiled file "
+                             "(also done by the scraper when tenants.json changes); "
+                             "check: only resolve the URLs and report problems")
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        compile_registry(probe=True)
+    else:
+        entries = [compile_entry(entry) for entry in load_registry()]
+        for entry in entries:
+            if entry["status"] == "ok":
+                print(f"{entry['name']}: {entry['endpoint']}")
+            else:
+                print(f"{entry['name']}: INVALID ({entry['error']})")
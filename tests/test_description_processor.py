@@ -0,0 +1,49 @@
+from description_processor import process_description
+
+def test_sanitizer_keeps_allowed_tags_only():
+    result = process_description(
+        '<div class="x"><h1>About</h1><p style="color:red">Build <b>fast</b> APIs.</p>'
+        '<script>alert(1)</script><p></p><a href="javascript:x">here</a>'
+        '<a href="https://example.com/apply">Apply</a></div>'
+    )
+    assert result["html"] == (
+        '<h3>About</h3><p>Build <b>fast</b> APIs.</p>here'
+        '<a href="https://example.com/apply" target="_blank" rel="nofollow">Apply</a>'
+    )
+
+def test_unwrapped_blocks_keep_words_apart():
+    result = process_description("<div>Hello</div><div>World</div>")
+    assert result["html"] == "Hello<br>World"
+    assert result["word_count"] == 2
+
+def test_table_cells_and_rows_are_separated():
+    result = process_description(
+        "<table><tr><td>Skills</td><td>Python</td></tr><tr><td>Location</td><td>Pune</td></tr></table>"
+    )
+    assert result["html"] == "Skills Python<br>Location Pune"
+    assert result["word_count"] == 4
+
+def test_word_count_matches_visible_words():
+    result = process_description("<p>Work with <b>data</b>teams</p><ul><li>Ship  code</li><li>Review</li></ul>")
+    # "data" and "teams" touch, so they read as one word
+    assert result["word_count"] == 6
+
+def test_experience_needs_an_experience_word_nearby():
+    assert process_description("<p>For over 125 years, we have built bridges.</p>")["experience"] is None
+    assert process_description("<p>Founded 50 years ago. Experience with Python.</p>")["experience"] is None
+    assert process_description("<p>3-5 years of experience in Java.</p>")["experience"] == "3-5 years"
+    assert process_description("<li>Experience: 4+ yrs building services</li>")["experience"] == "4+ years"
+
+def test_ambiguous_skills_outside_a_skills_section_are_ignored():
+    result = process_description("<p>Go beyond the brief. Excel at teamwork in a Spring offsite.</p>")
+    assert result["skills"] == []
+
+def test_ambiguous_skills_inside_a_skills_section_are_kept():
+    result = process_description(
+        "<h2>Requirements</h2><ul><li>Go</li><li>Python and Spark</li></ul><p>Excel at work.</p>"
+    )
+    assert result["skills"] == ["Go", "Python", "Spark"]
+
+def test_ambiguous_skills_next_to_a_skills_word_are_kept():
+    result = process_description("<p>Hands-on experience with React and Swift.</p>")
+    assert result["skills"] == ["React", "Swift"]
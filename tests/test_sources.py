@@ -0,0 +1,60 @@
+import os
+from sources import GreenhouseSource, LeverSource, collect_jobs
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Wide enough that the fixed fixture dates are always inside the window
+MAX_AGE_DAYS = 100000
+
+def greenhouse_source(name="greenhouse-example"):
+    return GreenhouseSource(name, fixture_path=os.path.join(FIXTURES, "greenhouse_jobs.json"),
+                            board_token="example", company="Example",
+                            company_url="https://www.example.com", max_age_days=MAX_AGE_DAYS)
+
+def lever_source(name="lever-example"):
+    return LeverSource(name, fixture_path=os.path.join(FIXTURES, "lever_postings.json"),
+                       site="example", company="Example",
+                       company_url="https://www.example.com", max_age_days=MAX_AGE_DAYS)
+
+def test_greenhouse_jobs_are_filtered_and_normalized():
+    jobs = collect_jobs([greenhouse_source()], limit=10)
+    assert [job["apply_url"] for job in jobs] == [
+        "https://boards.greenhouse.io/example/jobs/4010001",
+        "https://boards.greenhouse.io/example/jobs/4010003",
+    ]
+    job = jobs[0]
+    assert job["title"] == "Backend Engineer"
+    assert job["company"] == "Example"
+    assert job["location"] == "Bengaluru, Karnataka, India"
+    assert job["description"].startswith("<p>Build and run the APIs")
+    assert job["logo"].endswith("domain:example.com")
+    assert job["source"] == "greenhouse-example"
+
+def test_greenhouse_posting_date_is_first_published():
+    first, fallback = collect_jobs([greenhouse_source()], limit=10)
+    # Not updated_at (2 March), which moves whenever the posting is edited
+    assert first["posted_on"] == "20 February 2026"
+    assert fallback["posted_on"] == "25 February 2026"
+    assert first["posted_age_days"] > fallback["posted_age_days"]
+
+def test_lever_postings_are_filtered_and_normalized():
+    jobs = collect_jobs([lever_source()], limit=10)
+    assert len(jobs) == 1
+    job = jobs[0]
+    assert job["title"] == "Site Reliability Engineer"
+    assert job["apply_url"] == "https://jobs.lever.co/example/8a1c2d3e-0001"
+    assert job["location"] == "Hyderabad, India"
+    assert job["posted_on"] == "20 February 2026"
+    assert "<h3>Requirements</h3><ul><li>Experience with Kubernetes" in job["description"]
+    assert job["description"].endswith("<p>We value diverse teams.</p>")
+    assert job["source"] == "lever-example"
+
+def test_collect_jobs_merges_sources_in_order_without_repeats():
+    jobs = collect_jobs([lever_source(), greenhouse_source(), greenhouse_source("greenhouse-copy")], limit=10)
+    assert [job["source"] for job in jobs] == ["lever-example", "greenhouse-example", "greenhouse-example"]
+
+def test_collect_jobs_applies_the_limit_per_source():
+    jobs = collect_jobs([greenhouse_source(), lever_source()], limit=1)
+    assert [job["apply_url"] for job in jobs] == [
+        "https://boards.greenhouse.io/example/jobs/4010001",
+        "https://jobs.lever.co/example/8a1c2d3e-0001",
+    ]
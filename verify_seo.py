@@ -1,11 +1,10 @@
 import os
 import sys
-import re
 
 # Ensure we can import from the directory
 sys.path.append(os.getcwd())
 
-from content_builder import build_html_content
+from content_builder import render_post, style_size_report, MIN_WORD_COUNT
 from seo_utils import generate_seo_title, generate_slug, generate_meta_description, generate_labels, get_current_year
 
 def test_seo_upgrades():
@@ -27,17 +26,18 @@ def test_seo_upgrades():
     
     # 1. Test HTML Generation
     print("\n--- Testing HTML Generation ---")
-    html = build_html_content(job_data)
+    rendered = render_post(job_data)
+    html = rendered["html"]
     
-    # Word Count Check
-    text_content = re.sub(r'<[^>]+>', '', html)
-    word_count = len(text_content.split())
+    # Word Count Check (counted by the renderer, JSON-LD excluded)
+    word_count = rendered["word_count"]
     print(f"Total Word Count: {word_count}")
+    print(f"Words per section: {rendered['sections']}")
     
-    if word_count > 900:
-        print("[PASS] Word Count > 900 (AdSense Safe)")
+    if word_count >= MIN_WORD_COUNT:
+        print(f"[PASS] Word Count >= {MIN_WORD_COUNT} (AdSense Safe)")
     else:
-        print(f"[FAIL] Word Count Low ({word_count} words). Target: 900+")
+        print(f"[FAIL] Word Count Low ({word_count} words). Target: {MIN_WORD_COUNT}+")
 
     # Section Checks
     checks = {
@@ -56,6 +56,10 @@ def test_seo_upgrades():
         else:
             print(f"[FAIL] {name} Section Missing")
 
+    # Post size per style mode (class mode needs pages/post_styles.css in the theme)
+    sizes = style_size_report(job_data)
+    print(f"Post Size: {sizes['inline']} bytes inline, {sizes['class']} bytes with classes ({sizes['saved_percent']}% smaller)")
+
     # 2. Test SEO Utilities
     print("\n--- Testing SEO Utilities ---")
     
@@ -0,0 +1,50 @@
+import threading
+from datetime import datetime
+from disk_cache import load_state, save_state
+
+WATERMARKS_FILE = "workday_watermarks.json"
+
+# Only the most recent postings matter for the delta check, older ones
+# have long aged out of the search window.
+MAX_SEEN_PER_TENANT = 1000
+
+class TenantWatermarks:
+    """
+    Remembers which postings (by externalPath) were already processed for
+    each tenant, so the next run only fetches details for new ones.
+
+    State is stored as {tenant_key: {"seen": [...], "updated_at": iso}}
+    with the newest paths first. Safe to update from several threads.
+    """
+    def __init__(self, filename=WATERMARKS_FILE):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._state = load_state(filename, {})
+
+    def seen(self, tenant_key):
+        """Returns the set of externalPaths already processed for a tenant."""
+        with self._lock:
+            return set(self._state.get(tenant_key, {}).get("seen", []))
+
+    def mark(self, tenant_key, paths):
+        """Records `paths` as processed and advances the tenant's timestamp."""
+        paths = [p for p in paths if p]
+        if not paths:
+            return
+        with self._lock:
+            entry = self._state.setdefault(tenant_key, {"seen": []})
+            known = set(entry["seen"])
+            new_paths = [p for p in dict.fromkeys(paths) if p not in known]
+            entry["seen"] = (new_paths + entry["seen"])[:MAX_SEEN_PER_TENANT]
+            entry["updated_at"] = datetime.now().isoformat()
+
+    def mark_jobs(self, jobs):
+        """Marks scraped jobs processed by their `watermark` (tenant key, externalPath)."""
+        for job in jobs:
+            if job.get("watermark"):
+                key, path = job["watermark"]
+                self.mark(key, [path])
+
+    def save(self):
+        with self._lock:
+            save_state(self.filename, self._state)
@@ -1,83 +1,25 @@
-import requests
 import re
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from http_client import get_session
+from disk_cache import DiskCache, cache_path, load_state, save_state
+from watermarks import TenantWatermarks
+from tenant_health import TenantHealth
+from tenant_registry import load_companies, parse_tenant_url
 
-# Full list of companies from the request
-COMPANIES = [
-    {"name": "Boeing", "url": "https://boeing.wd1.myworkdayjobs.com/EXTERNAL_CAREERS"},
-    {"name": "3M", "url": "https://3m.wd1.myworkdayjobs.com/search"},
-    {"name": "Adobe", "url": "https://adobe.wd5.myworkdayjobs.com/external_experienced"},
-    {"name": "NVIDIA", "url": "https://nvidia.wd5.myworkdayjobs.com/NVIDIAExternalCareerSite"},
-    {"name": "Salesforce", "url": "https://salesforce.wd12.myworkdayjobs.com/External_Career_Site"},
-    {"name": "Target", "url": "https://target.wd5.myworkdayjobs.com/targetcareers"},
-    {"name": "Walmart", "url": "https://walmart.wd5.myworkdayjobs.com/WalmartExternal"},
-    {"name": "Chevron", "url": "https://chevron.wd5.myworkdayjobs.com/jobs"},
-    {"name": "Deloitte", "url": "https://deloitteie.wd3.myworkdayjobs.com/Early_Careers"},
-    {"name": "Puma", "url": "https://puma.wd3.myworkdayjobs.com/Jobs_at_Puma"},
-    {"name": "Sanofi", "url": "https://sanofi.wd3.myworkdayjobs.com/SanofiCareers"},
-    {"name": "Comcast", "url": "https://comcast.wd5.myworkdayjobs.com/Comcast_Careers"},
-    {"name": "Abbott", "url": "https://abbott.wd5.myworkdayjobs.com/abbottcareers"},
-    {"name": "Alcoa", "url": "https://alcoa.wd5.myworkdayjobs.com/careers/1/refreshFacet/318c8bb6f553100021d223d9780d30be"},
-    {"name": "American Electric Power", "url": "https://aep.wd1.myworkdayjobs.com/AEPCareerSite"},
-    {"name": "Amgen", "url": "https://amgen.wd1.myworkdayjobs.com/Careers"},
-    {"name": "Applied Materials", "url": "https://amat.wd1.myworkdayjobs.com/External"},
-    {"name": "Arrow Electronics", "url": "https://arrow.wd1.myworkdayjobs.com/AC"},
-    {"name": "Assurant", "url": "https://assurant.wd1.myworkdayjobs.com/Assurant_Careers"},
-    {"name": "AT&T", "url": "https://att.wd1.myworkdayjobs.com/ATTGeneral"},
-    {"name": "Avis Budget Group", "url": "https://avisbudget.wd1.myworkdayjobs.com/ABG_Careers"},
-    {"name": "BlackRock", "url": "https://blackrock.wd1.myworkdayjobs.com/BlackRock_Professional"},
-    {"name": "Bupa", "url": "https://bupa.wd3.myworkdayjobs.com/EXT_CAREER"},
-    {"name": "Cognizant", "url": "https://collaborative.wd1.myworkdayjobs.com/AllOpenings"},
-    {"name": "Workday", "url": "https://workday.wd5.myworkdayjobs.com/Workday"},
-    {"name": "Fidelity", "url": "https://wd1.myworkdaysite.com/en-US/recruiting/fmr/FidelityCareers"},
-    {"name": "AIG", "url": "https://aig.wd1.myworkdayjobs.com/aig"},
-    {"name": "Analog Devices", "url": "https://analogdevices.wd1.myworkdayjobs.com/External"},
-    {"name": "Intel", "url": "https://intel.wd1.myworkdayjobs.com/External"},
-    {"name": "Mastercard", "url": "https://mastercard.wd1.myworkdayjobs.com/CorporateCareers"},
-    {"name": "JLL", "url": "https://jll.wd1.myworkdayjobs.com/jllcareers"},
-    {"name": "CNX", "url": "https://cnx.wd1.myworkdayjobs.com/external_global"},
-    {"name": "Coca-Cola", "url": "https://coke.wd5.myworkdayjobs.com/coca-cola-careers"},
-    {"name": "Dell", "url": "https://dell.wd1.myworkdayjobs.com/External"},
-    {"name": "Bank of America", "url": "https://ghr.wd1.myworkdayjobs.com/Lateral-US"},
-    {"name": "Accenture", "url": "https://accenture.wd103.myworkdayjobs.com/en-US/AccentureCareers/"},
-    {"name": "PwC", "url": "https://pwc.wd3.myworkdayjobs.com/Global_Experienced_Careers"},
-    {"name": "Huron", "url": "https://huron.wd1.myworkdayjobs.com/huroncareers"},
-    {"name": "ING", "url": "https://ing.wd3.myworkdayjobs.com/ICSGBLCOR"},
-    {"name": "eBay", "url": "https://ebay.wd5.myworkdayjobs.com/apply/"},
-    {"name": "AstraZeneca", "url": "https://astrazeneca.wd3.myworkdayjobs.com/Careers"},
-    {"name": "Nexstar", "url": "https://nexstar.wd5.myworkdayjobs.com/nexstar"},
-    {"name": "Samsung", "url": "https://sec.wd3.myworkdayjobs.com/Samsung_Careers"},
-    {"name": "Warner Bros", "url": "https://warnerbros.wd5.myworkdayjobs.com/global"},
-    {"name": "Hitachi", "url": "https://hitachi.wd1.myworkdayjobs.com/hitachi"},
-    {"name": "Ciena", "url": "https://ciena.wd5.myworkdayjobs.com/Careers"},
-    {"name": "BDX", "url": "https://bdx.wd1.myworkdayjobs.com/EXTERNAL_CAREER_SITE_INDIA"},
-    {"name": "Cengage", "url": "https://cengage.wd5.myworkdayjobs.com/CengageIndiaCareers"},
-    {"name": "Pfizer", "url": "https://pfizer.wd1.myworkdayjobs.com/PfizerCareers"},
-    {"name": "Availity", "url": "https://availity.wd1.myworkdayjobs.com/Availity_Careers_India"},
-    {"name": "Wells Fargo", "url": "https://wd1.myworkdaysite.com/recruiting/wf/WellsFargoJobs"},
-    {"name": "Motorola Solutions", "url": "https://motorolasolutions.wd5.myworkdayjobs.com/Careers"},
-    {"name": "2020 Companies", "url": "https://2020companies.wd1.myworkdayjobs.com/External_Careers"},
-    {"name": "Kyndryl", "url": "https://kyndryl.wd5.myworkdayjobs.com/KyndrylProfessionalCareers"},
-    {"name": "IFF", "url": "https://iff.wd5.myworkdayjobs.com/en-US/iff_careers"},
-    {"name": "Light & Wonder", "url": "https://lnw.wd5.myworkdayjobs.com/LightWonderExternalCareers"},
-    {"name": "Bristol Myers Squibb", "url": "https://bristolmyerssquibb.wd5.myworkdayjobs.com/BMS"},
-    {"name": "Alcon", "url": "https://alcon.wd5.myworkdayjobs.com/careers_alcon"},
-    {"name": "DXC Technology", "url": "https://dxctechnology.wd1.myworkdayjobs.com/DXCJobs"},
-    {"name": "London Stock Exchange Group (LSEG)", "url": "https://lseg.wd3.myworkdayjobs.com/Careers"},
-    {"name": "Cigna", "url": "https://cigna.wd5.myworkdayjobs.com/cignacareers"},
-    {"name": "GE Vernova", "url": "https://gevernova.wd5.myworkdayjobs.com/Vernova_ExternalSite"},
-    {"name": "Clarivate", "url": "https://clarivate.wd3.myworkdayjobs.com/Clarivate_Careers"},
-    {"name": "Silicon Labs", "url": "https://silabs.wd1.myworkdayjobs.com/SiliconLabsCareers"},
-    {"name": "Micron", "url": "https://micron.wd1.myworkdayjobs.com/External"},
-    {"name": "Blackbaud", "url": "https://blackbaud.wd1.myworkdayjobs.com/ExternalCareers"},
-    {"name": "FIS", "url": "https://fis.wd5.myworkdayjobs.com/en-US/SearchJobs"},
-    {"name": "Web Industries", "url": "https://web.wd1.myworkdayjobs.com/ExternalCareerSite"},
-    {"name": "Qualys", "url": "https://qualys.wd5.myworkdayjobs.com/Careers"},
-    {"name": "Optiv", "url": "https://optiv.wd5.myworkdayjobs.com/Optiv_Careers"},
-    {"name": "T-Mobile", "url": "https://tmobile.wd5.myworkdayjobs.com/External"},
-    {"name": "Morningstar", "url": "https://morningstar.wd5.myworkdayjobs.com/Americas"}
-]
+# Tenants to scan, loaded on first use from the compiled registry
+# (recompiled when tenants.json changes, see tenant_registry.py)
+_companies = None
+_companies_lock = threading.Lock()
+
+def get_companies():
+    global _companies
+    with _companies_lock:
+        if _companies is None:
+            _companies = load_companies()
+        return _companies
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -85,119 +27,495 @@ HEADERS = {
     "Accept": "application/json"
 }
 
-def get_session():
-    return requests.Session()
+# Concurrency limits for the tenant scan.
+# MAX_WORKERS caps the total number of in-flight requests,
+# MAX_PER_HOST caps how many of those may hit the same Workday host.
+MAX_WORKERS = 16
+MAX_PER_HOST = 4
+# Detail fetches are sent in waves sized to the jobs still needed, plus
+# this many extra for candidates the detail location check filters out.
+DETAIL_HEADROOM = 5
+
+# Workday's search API serves at most 20 postings per request.
+# MAX_PAGES is a safety net against tenants that never age out.
+PAGE_SIZE = 20
+MAX_PAGES = 50
+
+# Job details are cached on disk between runs (see fetch_job_details).
+DETAIL_CACHE_FILE = "workday_details.sqlite3"
+DETAIL_CACHE_TTL = 14 * 24 * 3600
+DETAIL_CACHE_MAX_ENTRIES = 20000
+DETAIL_FIELDS = ("title", "jobDescription", "location", "postedOn")
+
+_detail_cache = None
+_detail_cache_lock = threading.Lock()
+
+# Which jobs we are interested in. Countries and cities are matched
+# against Workday's location text and location facets, keywords against
+# the job title. An empty list means "no restriction".
+JOB_FILTER = {
+    "countries": ["India"],
+    "cities": [],
+    "keywords": []
+}
+
+# Location facet IDs discovered per tenant are cached for this long.
+FACETS_FILE = "workday_facets.json"
+FACETS_TTL = 7 * 24 * 3600
+
+class WorkdayAPIError(Exception):
+    """Raised when a Workday endpoint answers with a non-200 status."""
+    def __init__(self, status_code):
+        super().__init__(f"API Error {status_code}")
+        self.status_code = status_code
+
+class HostLimiter:
+    """
+    Hands out a bounded semaphore per host so that no single
+    Workday host receives more than `per_host` concurrent requests.
+    """
+    def __init__(self, per_host=MAX_PER_HOST):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def __call__(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
 
 def resolve_api_parts(url):
     """
     Extracts host, tenant, and site to build API endpoints.
-    Supported pattern: https://<host>/<site>
+    See tenant_registry.parse_tenant_url for the supported URL patterns.
     """
-    match = re.search(r'https://([^/]+)/([^/]+)', url)
-    if match:
-        host = match.group(1)
-        site = match.group(2)
-        # Attempt to deduce tenant. Usually host is tenant.wdX...
-        # Workday host format is usually: <tenant>.wdX.myworkdayjobs.com
-        tenant = host.split('.')[0]
-        
-        # Special case for some URLs that might have paths, but the standard list is clean
-        return host, tenant, site
-    return None, None, None
-
-def fetch_job_details(host, tenant, site, job_slug):
+    return parse_tenant_url(url)
+
+def company_api_parts(company):
+    """Returns host, tenant and site of a company, preferring the precompiled ones."""
+    if company.get("host"):
+        return company["host"], company["tenant"], company["site"]
+    return resolve_api_parts(company["url"])
+
+def tenant_key(host, tenant, site):
+    """Identifies a Workday job board in caches and run state."""
+    return f"{host}/{tenant}/{site}"
+
+def get_detail_cache():
+    """Returns the process-wide job detail cache, opening it on first use."""
+    global _detail_cache
+    with _detail_cache_lock:
+        if _detail_cache is None:
+            _detail_cache = DiskCache(cache_path(DETAIL_CACHE_FILE), ttl=DETAIL_CACHE_TTL,
+                                      max_entries=DETAIL_CACHE_MAX_ENTRIES)
+        return _detail_cache
+
+def strip_job_details(details):
+    """Keeps only the jobPostingInfo fields that scrape_workday_jobs uses."""
+    info = details.get("jobPostingInfo", {})
+    return {"jobPostingInfo": {field: info.get(field, "") for field in DETAIL_FIELDS}}
+
+def fetch_job_details(host, tenant, site, job_slug, session=None, use_cache=True):
     """
     Fetches full job description using the job slug.
     API: https://<host>/wday/cxs/<tenant>/<site>/job/<slug>
+
+    The stripped details are cached on disk per host/tenant/site/slug,
+    so requisitions seen on an earlier run cost no request at all.
     """
+    cache_key = f"{host}/{tenant}/{site}/{job_slug}"
+    if use_cache:
+        cached = get_detail_cache().get(cache_key)
+        if cached is not None:
+            return cached
+
     url = f"https://{host}/wday/cxs/{tenant}/{site}/job/{job_slug}"
     try:
-        resp = requests.get(url, headers=HEADERS) # GET for details
-        if resp.status_code == 200:
-            return resp.json()
+        resp = (session or get_session()).get(url, headers=HEADERS, timeout=10) # GET for details
+        data = resp.json() if resp.status_code == 200 else {}
+        if "jobPostingInfo" in data:
+            details = strip_job_details(data)
+            if use_cache:
+                get_detail_cache().set(cache_key, details)
+            return details
     except Exception as e:
         print(f"Error fetching details for {job_slug}: {e}")
     return None
 
-def scrape_workday_jobs(limit=20):
+def matches_location(text, job_filter=JOB_FILTER):
+    """Checks a location string against the filter's countries and cities."""
+    text = (text or "").lower()
+    places = job_filter.get("countries", []) + job_filter.get("cities", [])
+    return not places or any(place.lower() in text for place in places)
+
+def matches_keywords(title, job_filter=JOB_FILTER):
+    """Checks a job title against the filter's keywords."""
+    title = (title or "").lower()
+    keywords = job_filter.get("keywords", [])
+    return not keywords or any(keyword.lower() in title for keyword in keywords)
+
+def collect_location_facets(facets, found=None):
     """
-    Iterates through companies and finds jobs posted TODAY.
-    Returns a list of detailed job objects.
+    Walks the `facets` block of a search response and returns
+    {facetParameter: [{"id": ..., "descriptor": ...}]} for every
+    country/location facet. Some tenants nest these inside a group
+    facet (e.g. locationMainGroup), so the walk is recursive.
     """
-    all_jobs = []
-    session = get_session()
-    
-    print(f"Scanning {len(COMPANIES)} companies for jobs posted TODAY...")
-    
-    for company in COMPANIES:
-        try:
-            host, tenant, site = resolve_api_parts(company["url"])
-            if not host:
+    found = {} if found is None else found
+    for facet in facets or []:
+        parameter = facet.get("facetParameter", "")
+        values = facet.get("values", [])
+        if any("facetParameter" in value for value in values):
+            collect_location_facets(values, found)
+            continue
+        if "location" in parameter.lower() or "country" in parameter.lower():
+            found[parameter] = [
+                {"id": value["id"], "descriptor": value.get("descriptor", "")}
+                for value in values if value.get("id")
+            ]
+    return found
+
+def build_applied_facets(location_facets, job_filter=JOB_FILTER):
+    """
+    Turns the discovered location facets into an `appliedFacets` payload.
+    Cities are preferred over countries because they are narrower.
+    Returns {} when the tenant has no facet matching the filter, in which
+    case the search falls back to client-side filtering.
+    """
+    for places, is_country in ((job_filter.get("cities", []), False),
+                               (job_filter.get("countries", []), True)):
+        if not places:
+            continue
+        for parameter, values in location_facets.items():
+            if ("country" in parameter.lower()) != is_country:
                 continue
-                
-            api_url = f"https://{host}/wday/cxs/{tenant}/{site}/jobs"
-            payload = {
-                "appliedFacets": {},
-                "limit": 20, # Check top 20 most recent
-                "offset": 0,
-                "searchText": ""
-            }
-            
+            ids = [value["id"] for value in values
+                   if any(place.lower() in value["descriptor"].lower() for place in places)]
+            if ids:
+                return {parameter: ids}
+    return {}
+
+class FacetCache:
+    """
+    Persists the location facets discovered for each tenant, so the
+    discovery request is made at most once per FACETS_TTL.
+    """
+    def __init__(self, filename=FACETS_FILE, ttl=FACETS_TTL):
+        self.filename = filename
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state = load_state(filename, {})
+        self._dirty = False
+
+    def get(self, key):
+        with self._lock:
+            entry = self._state.get(key)
+        if entry and time.time() - entry["discovered_at"] < self.ttl:
+            return entry["facets"]
+        return None
+
+    def set(self, key, facets):
+        with self._lock:
+            self._state[key] = {"facets": facets, "discovered_at": time.time()}
+            self._dirty = True
+
+    def invalidate(self, key):
+        with self._lock:
+            self._dirty = self._state.pop(key, None) is not None or self._dirty
+
+    def save(self):
+        with self._lock:
+            if self._dirty:
+                save_state(self.filename, self._state)
+                self._dirty = False
+
+def discover_location_facets(session, host, tenant, site, limiter, facet_cache):
+    """
+    Returns the tenant's location facets, asking the search API for them
+    (a single one-posting request) only if they are not cached yet.
+    """
+    key = tenant_key(host, tenant, site)
+    facets = facet_cache.get(key)
+    if facets is not None:
+        return facets
+
+    api_url = f"https://{host}/wday/cxs/{tenant}/{site}/jobs"
+    payload = {"appliedFacets": {}, "limit": 1, "offset": 0, "searchText": ""}
+    with limiter(host):
+        resp = session.post(api_url, headers=HEADERS, json=payload, timeout=10)
+    if resp.status_code != 200:
+        raise WorkdayAPIError(resp.status_code)
+
+    facets = collect_location_facets(resp.json().get("facets", []))
+    facet_cache.set(key, facets)
+    return facets
+
+def parse_posted_on(posted_on):
+    """
+    Converts Workday's relative `postedOn` text into an age in days.
+    "Posted Today" -> 0, "Posted Yesterday" -> 1, "Posted 3 Days Ago" -> 3,
+    "Posted 30+ Days Ago" -> 30. Returns None if the text is not recognised.
+    """
+    if not posted_on:
+        return None
+    text = posted_on.lower()
+    if "today" in text:
+        return 0
+    if "yesterday" in text:
+        return 1
+    match = re.search(r'(\d+)\+?\s*days?\s+ago', text)
+    if match:
+        return int(match.group(1))
+    return None
+
+def search_postings(session, host, tenant, site, limiter, max_age_days=0, seen=frozenset(),
+                    applied_facets=None):
+    """
+    Walks the paginated search API and yields postings that are at most
+    `max_age_days` old. Postings come back newest first, so pagination
+    stops as soon as a page contains anything older than the window.
+
+    Postings whose externalPath is in `seen` are not yielded, and a page
+    made up entirely of seen postings ends the walk as well.
+    `applied_facets` is passed through so Workday filters server-side.
+    """
+    api_url = f"https://{host}/wday/cxs/{tenant}/{site}/jobs"
+    offset = 0
+    total = None
+
+    for _ in range(MAX_PAGES):
+        payload = {
+            "appliedFacets": applied_facets or {},
+            "limit": PAGE_SIZE,
+            "offset": offset,
+            "searchText": ""
+        }
+        with limiter(host):
             resp = session.post(api_url, headers=HEADERS, json=payload, timeout=10)
-            if resp.status_code != 200:
-                print(f"Skipping {company['name']}: API Error {resp.status_code}")
+        if resp.status_code != 200:
+            raise WorkdayAPIError(resp.status_code)
+
+        data = resp.json()
+        postings = data.get("jobPostings", [])
+        # Only the first page reliably carries the total
+        if total is None:
+            total = data.get("total", 0)
+
+        out_of_window = False
+        all_seen = bool(postings)
+        for job in postings:
+            age = parse_posted_on(job.get("postedOn"))
+            if age is None:
                 continue
-                
-            data = resp.json()
-            postings = data.get("jobPostings", [])
-            
-            # Find jobs posted today
-            today_jobs = []
-            for job in postings:
-                if "postedOn" in job and "Today" in job["postedOn"]:
-                    today_jobs.append(job)
-            
-            if today_jobs:
-                print(f"Found {len(today_jobs)} new jobs at {company['name']}")
-                
-                for job in today_jobs:
-                    # Filter for INDIA jobs
-                    locations = job.get("locationsText", "") + job.get("location", "")
-                    if "India" not in locations and "INDIA" not in locations.upper():
-                         continue
-
-                    # Construct proper slug. 
-                    # externalPath is like /job/location/title_R123
-                    # API expects just title_R123 usually, or maybe full path works if we strip /job/
-                    # Let's try to extract the last part of externalPath
-                    slug = job["externalPath"].split('/')[-1]
-                    
-                    details = fetch_job_details(host, tenant, site, slug)
-                    if details:
-                         # Double check location in details
-                        det_loc = details["jobPostingInfo"].get("location", "")
-                        if "India" not in det_loc and "INDIA" not in det_loc.upper():
-                             continue
-
-                        all_jobs.append({
-                            "title": details["jobPostingInfo"]["title"],
-                            "company": company["name"],
-                            "company_url": company["url"],
-                            "description": details["jobPostingInfo"]["jobDescription"],
-                            "location": det_loc,
-                            "posted_on": details["jobPostingInfo"]["postedOn"],
-                            "apply_url": f"{company['url']}{job['externalPath']}",
-                            "logo": f"https://logos-api.apistemic.com/domain:{company['name'].replace(' ', '').lower()}.com"
-                        })
-
-            if len(all_jobs) >= limit:
-                 break
-                 
+            if age > max_age_days:
+                out_of_window = True
+                continue
+            if job.get("externalPath") in seen:
+                continue
+            all_seen = False
+            job["ageDays"] = age
+            yield job
+
+        offset += len(postings)
+        if out_of_window or all_seen or len(postings) < PAGE_SIZE or offset >= total:
+            return
+
+def search_company(session, company, limiter, max_age_days=0, watermarks=None,
+                   job_filter=JOB_FILTER, facet_cache=None):
+    """
+    Runs the job search for one company and returns the postings
+    that are within the freshness window and match `job_filter`.
+    Returns a list of (company, host, tenant, site, job) tuples.
+
+    With `facet_cache`, the tenant's location facets are discovered once
+    and the location filter is pushed into `appliedFacets`.
+    With `watermarks`, postings processed on earlier runs are skipped and
+    the filtered-out ones found now are marked as processed straight away.
+    Raises WorkdayAPIError if the tenant answers with a non-200 status.
+    """
+    host, tenant, site = company_api_parts(company)
+    if not host:
+        return []
+
+    key = tenant_key(host, tenant, site)
+    seen = watermarks.seen(key) if watermarks else frozenset()
+    applied_facets = {}
+    if facet_cache is not None:
+        location_facets = discover_location_facets(session, host, tenant, site, limiter, facet_cache)
+        applied_facets = build_applied_facets(location_facets, job_filter)
+    try:
+        fresh_jobs = list(search_postings(session, host, tenant, site, limiter, max_age_days, seen,
+                                          applied_facets))
+    except WorkdayAPIError:
+        if not applied_facets:
+            raise
+        # The cached facet IDs went stale; rediscover them next run
+        facet_cache.invalidate(key)
+        fresh_jobs = list(search_postings(session, host, tenant, site, limiter, max_age_days, seen))
+
+    if fresh_jobs:
+        print(f"Found {len(fresh_jobs)} new jobs at {company['name']}")
+
+    candidates = []
+    skipped = []
+    for job in fresh_jobs:
+        # Still checked client-side for tenants without a matching facet
+        locations = job.get("locationsText", "") + job.get("location", "")
+        if not matches_location(locations, job_filter) or not matches_keywords(job.get("title"), job_filter):
+            skipped.append(job.get("externalPath"))
+            continue
+        candidates.append((company, host, tenant, site, job))
+
+    if watermarks:
+        watermarks.mark(key, skipped)
+    return candidates
+
+def fetch_candidate(session, candidate, limiter, job_filter=JOB_FILTER):
+    """
+    Fetches the details for a search candidate and converts them into
+    the job record used by the rest of the pipeline.
+    Returns None if the details are unavailable or outside the filter.
+    """
+    company, host, tenant, site, job = candidate
+
+    # externalPath is like /job/location/title_R123
+    # The details API expects just the last part (title_R123)
+    slug = job["externalPath"].split('/')[-1]
+
+    with limiter(host):
+        details = fetch_job_details(host, tenant, site, slug, session=session)
+    if not details:
+        return None
+
+    # Double check location in details
+    det_loc = details["jobPostingInfo"].get("location", "")
+    if not matches_location(det_loc, job_filter):
+        return None
+
+    return {
+        "title": details["jobPostingInfo"]["title"],
+        "company": company["name"],
+        "company_url": company["url"],
+        "description": details["jobPostingInfo"]["jobDescription"],
+        "location": det_loc,
+        # The search result's postedOn is always current; the cached details may be days old
+        "posted_on": job.get("postedOn") or details["jobPostingInfo"]["postedOn"],
+        "posted_age_days": job.get("ageDays"),
+        "apply_url": f"{company.get('board_url', company['url'])}{job['externalPath']}",
+        "logo": f"https://logos-api.apistemic.com/domain:{company['name'].replace(' ', '').lower()}.com"
+    }
+
+def scrape_workday_jobs(limit=20, max_age_days=0, max_workers=MAX_WORKERS, max_per_host=MAX_PER_HOST,
+                        incremental=False, job_filter=None, use_facets=True, health=None, cancelled=None):
+    """
+    Iterates through companies and finds jobs posted within the last
+    `max_age_days` days (0 = TODAY only, 1 = today and yesterday, ...).
+    Returns a list of detailed job objects.
+
+    Searches and detail fetches run on a thread pool of `max_workers`
+    with at most `max_per_host` concurrent requests per host. Details are
+    only fetched for as many candidates as it takes to fill `limit`.
+    Results are merged in registry order regardless of completion order,
+    so the output is the same as a sequential scan. Pass max_workers=1
+    to scan strictly one request at a time.
+
+    With `incremental=True` the scan is a delta against the per-tenant
+    watermarks from earlier runs: postings already processed are neither
+    paged through nor fetched again. Postings filtered out as non-India
+    advance the watermark straight away; every returned job instead
+    carries its `watermark` (tenant key, externalPath) and is only marked
+    processed by the caller (TenantWatermarks.mark_jobs) once it has been
+    published or rejected as a duplicate, so anything the caller does not
+    use is offered again on the next run.
+
+    `job_filter` defaults to JOB_FILTER (India). With `use_facets` the
+    location part of the filter is applied server-side through each
+    tenant's location facets wherever the tenant offers them.
+
+    Every search is recorded in the tenant health registry (`health`,
+    a TenantHealth loaded from disk by default). Tenants whose circuit is
+    open are skipped without a request, and a summary is printed at the end.
+
+    `cancelled` is an optional threading.Event: once it is set, remaining
+    tenants and detail fetches are skipped and the watermarks are not
+    advanced, since the caller will not use this scan's results.
+    """
+    session = get_session()
+    limiter = HostLimiter(max_per_host)
+    watermarks = TenantWatermarks() if incremental else None
+    facet_cache = FacetCache() if use_facets else None
+    health = health or TenantHealth()
+    job_filter = job_filter or JOB_FILTER
+    companies = get_companies()
+    started = time.time()
+
+    window = "TODAY" if max_age_days == 0 else f"in the last {max_age_days} days"
+    print(f"Scanning {len(companies)} companies for jobs posted {window}...")
+
+    def search(company):
+        host, tenant, site = company_api_parts(company)
+        if not host or (cancelled and cancelled.is_set()):
+            return []
+        key = tenant_key(host, tenant, site)
+        if not health.allow(key):
+            print(f"Skipping {company['name']}: circuit open after repeated failures")
+            return []
+
+        request_started = time.time()
+        try:
+            found = search_company(session, company, limiter, max_age_days, watermarks,
+                                   job_filter, facet_cache)
+        except WorkdayAPIError as e:
+            print(f"Skipping {company['name']}: API Error {e.status_code}")
+            health.record_failure(key, time.time() - request_started, e, name=company["name"])
+            return []
         except Exception as e:
             print(f"Error scraping {company['name']}: {e}")
-            continue
-            
-    return all_jobs[:limit]
+            health.record_failure(key, time.time() - request_started, e, name=company["name"])
+            return []
+        health.record_success(key, time.time() - request_started, name=company["name"])
+        return found
+
+    def fetch(candidate):
+        if cancelled and cancelled.is_set():
+            return None
+        try:
+            return fetch_candidate(session, candidate, limiter, job_filter)
+        except Exception as e:
+            print(f"Error scraping {candidate[0]['name']}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # 1. Fan out the searches; map() keeps the registry order
+        candidates = [c for found in pool.map(search, companies) for c in found]
+
+        # 2. Fan out the detail fetches, again in a deterministic order,
+        #    stopping once `limit` jobs are in
+        all_jobs = []
+        fetched = 0
+        while fetched < len(candidates) and len(all_jobs) < limit:
+            wave = candidates[fetched:fetched + limit - len(all_jobs) + DETAIL_HEADROOM]
+            fetched += len(wave)
+            for candidate, job in zip(wave, pool.map(fetch, wave)):
+                if job and len(all_jobs) < limit:
+                    _, host, tenant, site, posting = candidate
+                    job["watermark"] = [tenant_key(host, tenant, site), posting["externalPath"]]
+                    all_jobs.append(job)
+
+    if cancelled and cancelled.is_set():
+        print("Workday scan cancelled, leaving the watermarks unchanged.")
+    elif watermarks:
+        watermarks.save()
+    if facet_cache:
+        facet_cache.save()
+    health.save()
+
+    cache = get_detail_cache()
+    print(f"Scan finished in {time.time() - started:.1f}s "
+          f"(detail cache: {cache.hits} hits, {cache.misses} misses)")
+    health.print_summary()
+    return all_jobs
 
 if __name__ == "__main__":
     jobs = scrape_workday_jobs()